@@ -4,6 +4,7 @@
 
 import sys
 import struct
+from array import array
 from pathlib import Path
 
 PAGE_SIZE = 2048
@@ -14,28 +15,28 @@ SEGMENT_POINTERS_OFFSET = 0x0800
 PAGE_SWITCH_MARK = 0x00000000
 SEGMENT_END_MARK = 0xFFFFFFFF
 
-
-def read_u32_be(buf, offset):
-    return int.from_bytes(buf[offset:offset + 4], "big")
+SEGMENT_POINTERS_STRUCT = struct.Struct(">8I")
 
 
 def read_segment_pointers(f):
     f.seek(SEGMENT_POINTERS_OFFSET)
-    raw = f.read(32)
+    raw = f.read(SEGMENT_POINTERS_STRUCT.size)
     if len(raw) != 32:
         raise RuntimeError("failed to read segment pointers (32 bytes)")
-    segs = [read_u32_be(raw, i * 4) for i in range(8)]
-    return segs
+    return list(SEGMENT_POINTERS_STRUCT.unpack(raw))
 
 
 def read_page(f, page_num):
-    """Read one 2048-byte page as 512 big-endian u32 words."""
+    """Read one 2048-byte page as an array of 512 u32 words."""
     offset = DATA_REGION_START + page_num * PAGE_SIZE
     f.seek(offset)
     buf = f.read(PAGE_SIZE)
     if len(buf) != PAGE_SIZE:
         raise RuntimeError(f"failed to read page {page_num} at offset 0x{offset:X}")
-    return [read_u32_be(buf, i * 4) for i in range(WORDS_PER_PAGE)]
+    words = array("I", buf)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words
 
 
 def dump_page_words(words, limit=64):
@@ -0,0 +1,95 @@
+"""
+attlib.dat 分析脚本共用的读取与 27 进制解码工具
+
+temp_* 系列脚本原先各自复制一份 decode_base27 和按页读取逻辑，
+统一放在这里，后续优化只需改一处。
+"""
+
+import struct
+import sys
+from array import array
+
+PAGE_SIZE = 2048
+WORDS_PER_PAGE = 512
+DATA_REGION_START = 0x1000
+SEGMENT_POINTERS_OFFSET = 0x0800
+
+BASE27_OFFSET = 0x81BF1
+MIN_HASH = 531442
+
+SEGMENT_POINTERS_STRUCT = struct.Struct(">8I")
+
+BASE27_TABLE = b" ABCDEFGHIJKLMNOPQRSTUVWXYZ"  # 余数 0 为空格，1..26 为 A..Z
+BASE27_ALPHABET = BASE27_TABLE.decode("ascii")
+# 低位在前的两位 27 进制组合表: BASE27_PAIRS[d0 + 27 * d1] == ALPHABET[d0] + ALPHABET[d1]
+BASE27_PAIRS = [a + b for b in BASE27_ALPHABET for a in BASE27_ALPHABET]
+# 恰好 4 位的 27 进制值区间 [27**3, 27**4)，多数 noun/属性名落在这里，走两次查表的展开路径
+BASE27_FOUR_DIGITS = range(27 ** 3, 27 ** 4)
+
+
+def decode_base27(hash_val):
+    """27 进制解码 (低位字符在前)，小于 MIN_HASH 的值返回空串"""
+    if hash_val < MIN_HASH:
+        return ""
+    k = hash_val - BASE27_OFFSET
+    if k in BASE27_FOUR_DIGITS:
+        return BASE27_PAIRS[k % 729] + BASE27_PAIRS[k // 729]
+    out = bytearray()
+    while k:
+        k, c = divmod(k, 27)
+        out.append(BASE27_TABLE[c])
+    return out.decode("ascii")
+
+
+def decode_base27_or_unk(hash_val):
+    """同 decode_base27，但无效值返回 unk_<值>，便于在输出中辨认"""
+    return decode_base27(hash_val) or f"unk_{hash_val}"
+
+
+def decode_base27_batch(hash_vals):
+    """批量解码: 重复 hash 只解码一次，结果与 decode_base27 逐个调用一致"""
+    cache = {}
+    names = []
+    for hash_val in hash_vals:
+        name = cache.get(hash_val)
+        if name is None:
+            name = cache[hash_val] = decode_base27(hash_val)
+        names.append(name)
+    return names
+
+
+def find_aligned_words(raw, needle, start=0):
+    """返回 needle 在 raw[start:] 中所有 4 字节对齐出现处的 word 下标 (相对 start，升序，允许重叠)
+
+    raw 可以是 bytes、mmap 或 array.tobytes() 的结果，needle 需与 raw 使用相同字节序。
+    """
+    hits = []
+    pos = raw.find(needle, start)
+    while pos != -1:
+        if (pos - start) % 4 == 0:
+            hits.append((pos - start) // 4)
+            pos = raw.find(needle, pos + 4)
+        else:
+            pos = raw.find(needle, pos + 1)
+    return hits
+
+
+def read_segment_pointers(f):
+    """读取 0x800 处的 8 个段起始页号 (大端序)"""
+    f.seek(SEGMENT_POINTERS_OFFSET)
+    return SEGMENT_POINTERS_STRUCT.unpack(f.read(SEGMENT_POINTERS_STRUCT.size))
+
+
+def read_page_bytes(f, page_num, page_count=1):
+    """读取从 page_num 开始连续 page_count 页的原始字节"""
+    f.seek(DATA_REGION_START + page_num * PAGE_SIZE)
+    return f.read(page_count * PAGE_SIZE)
+
+
+def read_words(f, start_page, end_page):
+    """把 [start_page, end_page) 一次读入单个 u32 数组 (大端序)"""
+    data = read_page_bytes(f, start_page, end_page - start_page)
+    words = array("I", data[:len(data) // 4 * 4])
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words
@@ -1,5 +1,12 @@
 import struct
 import sys
+from array import array
+
+from attlib_io import find_aligned_words
+
+WORDS_PER_PAGE = 512
+WORDS_PER_PAGE_SHIFT = 9  # 字下标 >> 9 即页号
+WORDS_PER_PAGE_MASK = WORDS_PER_PAGE - 1  # 字下标 & 0x1FF 即槽位
 
 def scan_attlib(file_path, target_hashes):
     with open(file_path, 'rb') as f:
@@ -16,25 +23,25 @@ def scan_attlib(file_path, target_hashes):
         f.seek(0x1000)
         data = f.read()
         
-        words = []
-        for i in range(0, len(data), 4):
-            if i + 4 <= len(data):
-                words.append(struct.unpack('>I', data[i:i+4])[0])
+        # 整个数据区一次转成连续的 u32 数组 (大端序)，不再逐 word 解包
+        words = array('I', data[:len(data) // 4 * 4])
+        if sys.byteorder == 'little':
+            words.byteswap()
         
         print(f"总 words: {len(words)}")
         
         for h in target_hashes:
             print(f"\n查找 Hash: {h} (0x{h:08X})")
             found = False
-            for i, word in enumerate(words):
-                if word == h:
-                    page = i // 512
-                    slot = i % 512
-                    print(f"  找到匹配! Word 索引: {i} -> 页: {page}, 槽: {slot}")
-                    # 打印上下文
-                    ctx = words[max(0, i-2):min(len(words), i+5)]
-                    print(f"  上下文: {[hex(x) for x in ctx]}")
-                    found = True
+            # 在原始字节上用 bytes.find 定位 h (大端序) 的所有 4 字节对齐出现位置
+            for i in find_aligned_words(data, struct.pack('>I', h)):
+                page = i >> WORDS_PER_PAGE_SHIFT
+                slot = i & WORDS_PER_PAGE_MASK
+                print(f"  找到匹配! Word 索引: {i} -> 页: {page}, 槽: {slot}")
+                # 打印上下文
+                ctx = words[max(0, i-2):min(len(words), i+5)]
+                print(f"  上下文: {[hex(x) for x in ctx]}")
+                found = True
             if not found:
                 print("  未找到匹配")
 
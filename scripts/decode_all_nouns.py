@@ -1,21 +1,7 @@
 
 import json
 
-def decode_base27(hash_val):
-    BASE27_OFFSET = 0x81BF1
-    if hash_val < 531442: return f"unk_{hash_val}"
-    k = hash_val - BASE27_OFFSET
-    chars = []
-    # 假设它是4字符
-    # 像 NAME (639374 -> 107933) -> N(14), A(1), M(13), E(5)
-    # 14 + 1*27 ...
-    # k % 27 -> char 1
-    while k > 0:
-        c = k % 27
-        if c == 0: chars.append(' ')
-        else: chars.append(chr(c + 64))
-        k //= 27
-    return "".join(chars)
+from attlib_io import decode_base27_batch
 
 path = "/Volumes/DPC/work/plant-code/rs-core/all_attr_info_v3.json"
 with open(path, 'r') as f:
@@ -25,13 +11,22 @@ if "noun_attr_info_map" in data:
     data = data["noun_attr_info_map"]
 
 print(f"Total Nouns: {len(data)}")
-for h in data.keys():
+# 先收集全部可解析的 hash，再一次性批量解码 (查表取两位，重复值只算一次)
+keys = list(data.keys())
+hash_vals = []
+for h in keys:
     try:
-        h_int = int(h)
-        name = decode_base27(h_int)
-        print(f"{h}: {name}")
-    except:
+        hash_vals.append(int(h))
+    except ValueError:
+        hash_vals.append(None)
+names = iter(decode_base27_batch([h_int for h_int in hash_vals if h_int is not None]))
+
+for h, h_int in zip(keys, hash_vals):
+    if h_int is None:
         print(f"{h}: Decode error")
+        continue
+    name = next(names) or f"unk_{h_int}"
+    print(f"{h}: {name}")
 
 # Also check specific candidates
 # PIPE 
@@ -1,6 +1,6 @@
 
-import struct
 import sys
+from array import array
 
 path = "/Volumes/DPC/work/plant-code/aios-parse-pdms-fork/data/attlib.dat"
 
@@ -20,31 +20,42 @@ def decode_base27_be(hash_val):
 
 with open(path, 'rb') as f:
     data = f.read()
-    words = list(struct.unpack(f'>{len(data)//4}I', data))
+# 整个文件放进一个 u32 数组 (大端序)，不再为每个字生成独立的 int 对象
+words = array('I', data[:len(data) // 4 * 4])
+if sys.byteorder == 'little':
+    words.byteswap()
 
 s3_start = 1433 * 512
-noun_attrs = {}
 
-curr = s3_start
-while curr + 2 < len(words):
-    attr = words[curr]
-    if attr == 0xFFFFFFFF: break
-    noun_id = words[curr+1]
-    offset = words[curr+2]
-    
-    if noun_id not in noun_attrs:
-        noun_attrs[noun_id] = []
-    noun_attrs[noun_id].append((attr, offset))
-    curr += 3
+# ATNAIN 三元组 [attr, noun_id, offset] 按列切成三个数组，截到第一个结束标记
+triple_count = (len(words) - s3_start) // 3
+attrs = words[s3_start:s3_start + 3 * triple_count:3]
+try:
+    triple_count = attrs.index(0xFFFFFFFF)
+except ValueError:
+    pass
+attrs = attrs[:triple_count]
+nouns = words[s3_start + 1:s3_start + 3 * triple_count:3]
+offsets = words[s3_start + 2:s3_start + 3 * triple_count:3]
+
+noun_attrs = {}
+for attr, noun_id, offset in zip(attrs, nouns, offsets):
+    noun_attrs.setdefault(noun_id, []).append((attr, offset))
 
 print(f"Loaded {len(noun_attrs)} nouns from ATNAIN.")
 
+# 同一属性 hash 会在许多 noun 下重复出现，先按唯一 hash 解码并格式化一次
+label_of = {
+    a: f"{decode_base27_be(a)}({a})"
+    for a in {a for attrs in noun_attrs.values() for a, _ in attrs}
+}
+
+# 整个文本在内存里拼好后一次写出
+lines = [
+    f"ID {nid}: {', '.join([f'{label_of[a]}@{off}' for a, off in attrs])}\n"
+    for nid, attrs in noun_attrs.items()
+]
 with open("/Volumes/DPC/work/plant-code/rs-core/scripts/atnain_dump.txt", "w") as f:
-    for nid, attrs in noun_attrs.items():
-        attr_strs = []
-        for a, off in attrs:
-            name = decode_base27_be(a)
-            attr_strs.append(f"{name}({a})@{off}")
-        f.write(f"ID {nid}: {', '.join(attr_strs)}\n")
+    f.write("".join(lines))
 
 print("Dumped to atnain_dump.txt")
@@ -16,9 +16,12 @@ E3D 属性解析器 - 完整实现
     python e3d_attribute_parser.py <attlib.dat> <database.db> [element_refno]
 """
 
+import mmap
 import struct
 import os
 import sys
+from array import array
+from collections import Counter, OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import IntEnum
@@ -31,6 +34,9 @@ from enum import IntEnum
 # attlib.dat 常量
 ATTLIB_PAGE_SIZE = 2048
 ATTLIB_WORDS_PER_PAGE = 512
+ATTLIB_WORDS_PER_PAGE_SHIFT = 9  # combined >> 9 即页号
+ATTLIB_WORDS_PER_PAGE_MASK = ATTLIB_WORDS_PER_PAGE - 1  # combined & 0x1FF 即页内偏移
+assert ATTLIB_WORDS_PER_PAGE == 1 << ATTLIB_WORDS_PER_PAGE_SHIFT
 ATTLIB_DATA_REGION_START = 0x1000
 ATTLIB_SEGMENT_POINTERS_OFFSET = 0x0800
 ATTLIB_MIN_HASH = 531442
@@ -42,6 +48,18 @@ ATTLIB_SEGMENT_END_MARK = 0xFFFFFFFF
 E3D_DEFAULT_PAGE_SIZE = 512
 E3D_ATTRIBUTE_PAGE_SUBTYPE = 63068511  # 0x3C0A13F
 
+# 预编译的大端序解包器: 直接按偏移从缓冲区 unpack_from，不再每次解析格式串和切片
+BE_U32 = struct.Struct('>I')
+BE_I32 = struct.Struct('>i')
+BE_F32 = struct.Struct('>f')
+BE_VEC3 = struct.Struct('>3f')
+BE_PAGE_HEADER = struct.Struct('>2I')  # 页头: page_type, type_id
+# 数据库文件头: version@0x04, db_id@0x08, page_size@0x34, page_count@0x38
+E3D_HEADER = struct.Struct('>4x2I40x2I')
+
+# TEXT 字符查表: 可打印 ASCII (32..126) 保持原样，其余替换为 '?'
+TEXT_PRINTABLE_TABLE = bytes(c if 32 <= c < 127 else ord('?') for c in range(256))
+
 # 数据页面子类型
 DATA_PAGE_SUBTYPES = {
     7618377: "主要数据页面",
@@ -65,11 +83,69 @@ class DataType(IntEnum):
     ORIENTATION = 8  # 朝向 (3x3 矩阵)
 
 
+# DTYP 数值 -> DataType 成员，未知数值查表时回落到 DataType.UNKNOWN
+DATA_TYPE_BY_VALUE = {member.value: member for member in DataType}
+
+
+# 各 DTYP 的值读取函数 (page_data, offset) -> value，均基于预编译的 Struct
+def _read_logical(page_data, offset):
+    return bool(BE_U32.unpack_from(page_data, offset)[0])
+
+
+def _read_integer(page_data, offset):
+    return BE_I32.unpack_from(page_data, offset)[0]
+
+
+def _read_real(page_data, offset):
+    return BE_F32.unpack_from(page_data, offset)[0]
+
+
+def _read_u32(page_data, offset):
+    return BE_U32.unpack_from(page_data, offset)[0]
+
+
+def _read_text(page_data, offset):
+    # 文本格式: 4字节长度 + 内容
+    length = BE_U32.unpack_from(page_data, offset)[0]
+    text_data = page_data[offset+4:offset+4+length*4]
+    # 将 32-bit words 转换为字符串
+    # 常见情况: 每个字的高 3 字节全为 0，字符就是低字节，整体切片后一次查表
+    if len(text_data) % 4 == 0:
+        low = text_data[3::4]
+        high = text_data[0::4] + text_data[1::4] + text_data[2::4]
+        if high.count(0) == len(high):
+            return low.translate(TEXT_PRINTABLE_TABLE).decode('ascii')
+        # 少数字的高位非 0 (超出单字节范围): 在低字节副本上把这些位置标成 '?'，仍一次查表
+        masked = bytearray(low)
+        for i, (b0, b1, b2) in enumerate(zip(text_data[0::4], text_data[1::4], text_data[2::4])):
+            if b0 | b1 | b2:
+                masked[i] = 0x3F
+        return masked.translate(TEXT_PRINTABLE_TABLE).decode('ascii')
+    chars = []
+    for i in range(0, len(text_data), 4):
+        word = BE_U32.unpack_from(text_data, i)[0]
+        chars.append(chr(word) if 32 <= word < 127 else '?')
+    return ''.join(chars)
+
+
+# DTYP -> 读取函数; 未列出的类型按单个 u32 读取
+# POSITION/DIRECTION 的返回值就是整个三元组，直接使用绑定了格式的 BE_VEC3.unpack_from，不再经过 Python 包装函数
+ATTRIBUTE_VALUE_READERS = {
+    DataType.LOGICAL: _read_logical,
+    DataType.INTEGER: _read_integer,
+    DataType.REAL: _read_real,
+    DataType.REFERENCE: _read_u32,
+    DataType.POSITION: BE_VEC3.unpack_from,
+    DataType.DIRECTION: BE_VEC3.unpack_from,
+    DataType.TEXT: _read_text,
+}
+
+
 # ============================================================================
-# 数据结构
+# 数据结构 (slots=True: 实例不带 __dict__，大量绑定/定义记录时内存占用更小)
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AttributeMetadata:
     """
     属性元数据 - 模拟 db4_get_att_dets 返回的结构
@@ -87,7 +163,7 @@ class AttributeMetadata:
     is_restricted: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AttlibAttrDefinition:
     """attlib.dat 中的属性定义"""
     attr_hash: int
@@ -96,7 +172,7 @@ class AttlibAttrDefinition:
     default_value: Any = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NounAttributeBinding:
     """Noun-属性绑定 (ATNAIN)"""
     noun_id: int
@@ -118,17 +194,19 @@ class AttlibCache:
     
     def __init__(self, max_entries: int = 64):
         self.max_entries = max_entries
-        self.cache: Dict[int, AttributeMetadata] = {}
-        self.access_order: List[int] = []
+        # attr_id -> 元数据; 插入/访问顺序即 LRU 顺序，队首为最久未使用的条目
+        self.cache: "OrderedDict[int, AttributeMetadata]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self.cache)
     
     def get(self, attr_id: int) -> Optional[AttributeMetadata]:
         """查询缓存"""
-        if attr_id in self.cache:
+        metadata = self.cache.get(attr_id)
+        if metadata is not None:
             # 更新访问顺序
-            self.access_order.remove(attr_id)
-            self.access_order.append(attr_id)
-            return self.cache[attr_id]
-        return None
+            self.cache.move_to_end(attr_id)
+        return metadata
     
     def put(self, metadata: AttributeMetadata) -> None:
         """添加到缓存"""
@@ -137,16 +215,21 @@ class AttlibCache:
         
         # 如果缓存满了，移除最旧的条目
         if len(self.cache) >= self.max_entries:
-            oldest = self.access_order.pop(0)
-            del self.cache[oldest]
+            self.cache.popitem(last=False)
         
         self.cache[metadata.attr_id] = metadata
-        self.access_order.append(metadata.attr_id)
     
     def clear(self) -> None:
         """清空缓存"""
         self.cache.clear()
-        self.access_order.clear()
+
+
+def _find_word(words: array, value: int) -> int:
+    """返回 value 在 words 中首次出现的位置，不存在时返回 len(words)"""
+    try:
+        return words.index(value)
+    except ValueError:
+        return len(words)
 
 
 # ============================================================================
@@ -164,47 +247,50 @@ class AttlibDataSource:
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.file = None
+        self.mm: Optional[mmap.mmap] = None
+        self.words = array('I')  # 数据区扁平字数组，全局字下标 = 页号 * 512 + 页内偏移
         self.attr_definitions: Dict[int, AttlibAttrDefinition] = {}
         self.hash_to_combined_id: Dict[int, int] = {}
         self.noun_attr_bindings: List[NounAttributeBinding] = []
+        # (NounID, AttrID) -> Offset，同一键重复出现时保留第一条绑定
+        self.binding_offsets: Dict[Tuple[int, int], int] = {}
         self.segment_pointers: List[int] = []
-        self.page_cache: Dict[int, List[int]] = {}
+        # 兜底扫描索引: Hash -> (DTYP, 默认值标志)，只记录扫描顺序中的首个命中
+        self.scan_index: Dict[int, Tuple[int, int]] = {}
         
         self._open()
         self._load()
     
     def _open(self) -> None:
-        """打开 attlib.dat 文件"""
+        """只读映射 attlib.dat，读出段指针并把整个数据区复制进 self.words 后立即关闭文件和映射"""
         self.file = open(self.file_path, 'rb')
-        self._read_segment_pointers()
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_segment_pointers()
+            self._load_words()
+        finally:
+            # 之后的解析只读 self.words，不再需要文件句柄和映射
+            self.close()
+    
+    def _load_words(self) -> None:
+        """把数据区一次解码成大端序 u32 扁平数组，供整段顺序扫描使用"""
+        data_end = ATTLIB_DATA_REGION_START + max(0, len(self.mm) - ATTLIB_DATA_REGION_START) // 4 * 4
+        self.words = array('I')
+        with memoryview(self.mm) as mv, mv[ATTLIB_DATA_REGION_START:data_end] as data:
+            self.words.frombytes(data)
+        if sys.byteorder == 'little':
+            self.words.byteswap()
     
     def _read_segment_pointers(self) -> None:
         """读取段指针表"""
-        self.file.seek(ATTLIB_SEGMENT_POINTERS_OFFSET)
-        for _ in range(8):
-            data = self.file.read(4)
-            if len(data) == 4:
-                ptr = struct.unpack('>I', data)[0]  # 大端序
-                self.segment_pointers.append(ptr)
-    
-    def _read_page(self, page_num: int) -> List[int]:
-        """读取指定页"""
-        if page_num in self.page_cache:
-            return self.page_cache[page_num]
-        
-        file_offset = ATTLIB_DATA_REGION_START + page_num * ATTLIB_PAGE_SIZE
-        self.file.seek(file_offset)
-        page_data = self.file.read(ATTLIB_PAGE_SIZE)
-        
-        words = []
-        for i in range(ATTLIB_WORDS_PER_PAGE):
-            word_bytes = page_data[i*4:(i+1)*4]
-            if len(word_bytes) == 4:
-                word = struct.unpack('>I', word_bytes)[0]
-                words.append(word)
-        
-        self.page_cache[page_num] = words
-        return words
+        # 直接从内存映射解包，文件不足 32 字节时只取完整的指针
+        count = min(8, max(0, len(self.mm) - ATTLIB_SEGMENT_POINTERS_OFFSET) // 4)
+        self.segment_pointers.extend(struct.unpack_from(f'>{count}I', self.mm, ATTLIB_SEGMENT_POINTERS_OFFSET))  # 大端序
+    
+    def _read_page(self, page_num: int) -> array:
+        """读取指定页: 直接切出扁平字数组中的一页，不再逐页解包和缓存"""
+        start = page_num * ATTLIB_WORDS_PER_PAGE
+        return self.words[start:start + ATTLIB_WORDS_PER_PAGE]
     
     def _load(self) -> None:
         """加载加载索引、定义和 Noun 绑定"""
@@ -214,6 +300,9 @@ class AttlibDataSource:
         print(f"已加载索引项: {len(self.hash_to_combined_id)}")
         self._load_atnain()  # 加载 Noun-属性绑定
         print(f"已加载 Noun-属性绑定: {len(self.noun_attr_bindings)}")
+        for binding in self.noun_attr_bindings:
+            self.binding_offsets.setdefault((binding.noun_id, binding.attr_id), binding.offset)
+        self._build_scan_index()  # 兜底扫描所用页面是固定的，一次建好索引
     
     def _load_atgtix(self) -> None:
         """加载 ATGTIX 段 (属性哈希到 CombinedID 的映射)"""
@@ -221,44 +310,59 @@ class AttlibDataSource:
             print("错误: 段指针不足，无法定位 ATGTIX")
             return
             
+        # 已扫描过的页区间 [起始页, 结束页]。前一段若一路扫过了后一段的起始页，
+        # 从该页开始的解析结果只是已有结果的后缀，无需重复扫描
+        scanned_ranges: List[Tuple[int, int]] = []
+        
         # 尝试遍历可能的索引段 (通常是段 1, 2, 3)
         for segment_idx in [1, 2, 3]:
             start_page = self.segment_pointers[segment_idx]
             if start_page == 0: continue
             
+            if any(lo <= start_page <= hi for lo, hi in scanned_ranges):
+                print(f"段 {segment_idx} (页 {start_page}) 已被前面的扫描覆盖，跳过")
+                continue
+            
             print(f"正在从段 {segment_idx} (页 {start_page}) 加载索引...")
-            page_num = start_page
+            page_num = self._scan_atgtix_run(start_page)
             
-            while True:
-                words = self._read_page(page_num)
-                word_idx = 0
-                found_in_page = 0
-                
-                while word_idx < ATTLIB_WORDS_PER_PAGE:
-                    word = words[word_idx]
-                    word_idx += 1
-                    
-                    if word == ATTLIB_PAGE_SWITCH_MARK:
-                        page_num += 1
-                        word_idx = 0
-                        words = self._read_page(page_num)
-                        continue
-                    
-                    if word == ATTLIB_SEGMENT_END_MARK:
-                        break
-                    
-                    # ATGTIX 条目: [Hash][CombinedID]
-                    if ATTLIB_MIN_HASH <= word <= ATTLIB_MAX_HASH:
-                        attr_hash = word
-                        if word_idx < ATTLIB_WORDS_PER_PAGE:
-                            combined_id = words[word_idx]
-                            word_idx += 1
-                            self.hash_to_combined_id[attr_hash] = combined_id
-                            found_in_page += 1
-                
-                if found_in_page == 0 or words[0] == ATTLIB_SEGMENT_END_MARK:
-                    break
-                page_num += 1
+            scanned_ranges.append((start_page, page_num))
+
+    def _scan_atgtix_run(self, start_page: int) -> int:
+        """从 start_page 开始解析一段 ATGTIX 条目，返回停止时所在的页号
+        
+        在扁平字数组上用单一游标推进 (全局字下标 = 页号 * 512 + 页内偏移)，
+        换页只是游标跳到下一页页首，不再逐页重取。
+        """
+        words = self.words
+        mask = ATTLIB_WORDS_PER_PAGE_MASK
+        pos = start_page * ATTLIB_WORDS_PER_PAGE
+        found_in_page = 0
+        
+        while True:
+            word = words[pos]
+            pos += 1
+            
+            if word == ATTLIB_PAGE_SWITCH_MARK:
+                pos = ((pos - 1) | mask) + 1
+                continue
+            
+            if word != ATTLIB_SEGMENT_END_MARK:
+                # ATGTIX 条目: [Hash][CombinedID]，CombinedID 不跨页
+                if ATTLIB_MIN_HASH <= word <= ATTLIB_MAX_HASH and pos & mask:
+                    self.hash_to_combined_id[word] = words[pos]
+                    pos += 1
+                    found_in_page += 1
+                if pos & mask:
+                    continue
+            pos -= 1  # 让 pos 落回刚读完的页内
+            
+            # 读到段结束标记或读完一页: 本轮无条目或页首即结束标记时停止
+            page_start = pos & ~mask
+            if found_in_page == 0 or words[page_start] == ATTLIB_SEGMENT_END_MARK:
+                return page_start >> ATTLIB_WORDS_PER_PAGE_SHIFT
+            pos = page_start + ATTLIB_WORDS_PER_PAGE
+            found_in_page = 0
 
     def _load_atnain(self) -> None:
         """加载 ATNAIN 段 (Noun-属性绑定)"""
@@ -267,40 +371,43 @@ class AttlibDataSource:
             
         start_page = self.segment_pointers[3] # 通常是段 3
         page_num = start_page
+        found_in_page = 0
+        # 每页可容纳的完整三元组: 起点 0, 3, ..., 507
+        triple_limit = ATTLIB_WORDS_PER_PAGE - 2
+        
+        words = self.words
         
         while True:
-            words = self._read_page(page_num)
-            word_idx = 0
-            found_in_page = 0
+            # ATNAIN 条目格式: [AttrID, NounID, Offset]，直接在扁平字数组上按列切出整页三元组，
+            # 不再先复制出整页
+            base = page_num * ATTLIB_WORDS_PER_PAGE
+            attr_ids = words[base:base + triple_limit:3]
+            noun_ids = words[base + 1:base + triple_limit + 1:3]
+            offsets = words[base + 2:base + triple_limit + 2:3]
             
-            while word_idx + 2 < ATTLIB_WORDS_PER_PAGE:
-                # ATNAIN 条目格式: [AttrID, NounID, Offset]
-                attr_id = words[word_idx]
-                noun_id = words[word_idx + 1]
-                offset = words[word_idx + 2]
-                
-                if attr_id == ATTLIB_PAGE_SWITCH_MARK:
-                    page_num += 1
-                    word_idx = 0
-                    words = self._read_page(page_num)
-                    continue
-                
-                if attr_id == ATTLIB_SEGMENT_END_MARK:
-                    return
-                
-                if ATTLIB_MIN_HASH <= attr_id <= ATTLIB_MAX_HASH:
-                    self.noun_attr_bindings.append(NounAttributeBinding(
-                        noun_id=noun_id,
-                        attr_id=attr_id,
-                        offset=offset
-                    ))
-                    found_in_page += 1
-                
-                word_idx += 3
+            # 在 AttrID 列上用 C 层查找定位换页/结束标记，只处理标记之前的条目
+            switch_at = _find_word(attr_ids, ATTLIB_PAGE_SWITCH_MARK)
+            end_at = _find_word(attr_ids, ATTLIB_SEGMENT_END_MARK)
+            cut = min(switch_at, end_at)
+            
+            bindings = [
+                NounAttributeBinding(noun_id=noun_id, attr_id=attr_id, offset=offset)
+                for attr_id, noun_id, offset in zip(attr_ids[:cut], noun_ids[:cut], offsets[:cut])
+                if ATTLIB_MIN_HASH <= attr_id <= ATTLIB_MAX_HASH
+            ]
+            self.noun_attr_bindings.extend(bindings)
+            found_in_page += len(bindings)
+            
+            if end_at < switch_at:
+                return
+            
+            page_num += 1
+            if switch_at < len(attr_ids):
+                continue
             
             if found_in_page == 0:
                 break
-            page_num += 1
+            found_in_page = 0
 
     def get_attr_definition(self, attr_id: int) -> Optional[AttlibAttrDefinition]:
         """通过哈希查找属性定义"""
@@ -315,14 +422,14 @@ class AttlibDataSource:
         # 修正 CombinedID 解析
         # 扫描发现 POS (0x853B1) 在 1860+ 页，NAME (0x9C18E) 在 1463 页
         # CombinedID 可能直接就是 Word 序号
-        target_page = combined_id // ATTLIB_WORDS_PER_PAGE
-        slot = combined_id % ATTLIB_WORDS_PER_PAGE
+        target_page = combined_id >> ATTLIB_WORDS_PER_PAGE_SHIFT
+        slot = combined_id & ATTLIB_WORDS_PER_PAGE_MASK
         
         attr_def = self._check_slot(target_page, slot, attr_id)
         if attr_def: return attr_def
         
         # 尝试相对于段 0 的偏移 (segment_pointers[0] = 3)
-        target_page_rel = self.segment_pointers[0] + combined_id // ATTLIB_WORDS_PER_PAGE
+        target_page_rel = self.segment_pointers[0] + (combined_id >> ATTLIB_WORDS_PER_PAGE_SHIFT)
         attr_def = self._check_slot(target_page_rel, slot, attr_id)
         if attr_def: return attr_def
 
@@ -345,8 +452,8 @@ class AttlibDataSource:
                 return attr_def
         return None
 
-    def _scan_for_attr(self, attr_id: int) -> Optional[AttlibAttrDefinition]:
-        """最后的手段：在所有已知段和核心页中扫描哈希"""
+    def _build_scan_index(self) -> None:
+        """遍历兜底扫描涉及的全部页面一次，建立 Hash -> (DTYP, 默认值标志) 索引"""
         # 1. 扫描所有段指针指定的起始页
         pages_to_scan = list(self.segment_pointers)
         # 2. 补充扫描发现的核心页
@@ -355,29 +462,36 @@ class AttlibDataSource:
         # 去重并排序
         pages_to_scan = sorted(list(set(pages_to_scan)))
         
+        scan_index = self.scan_index
         for page_num in pages_to_scan:
             if page_num == 0: continue
             words = self._read_page(page_num)
-            for i, word in enumerate(words):
-                if word == attr_id:
-                    # 发现哈希后，其后紧跟的通常是 DTYP
-                    data_type = words[i + 1] if i + 1 < len(words) else 0
-                    default_flag = words[i + 2] if i + 2 < len(words) else 0
-                    
-                    # 过滤掉显然错误的 DTYP (例如大于 10 的值通常是其他数据)
-                    if not (1 <= data_type <= 8):
-                        # 如果紧跟的不像 DTYP，可能 DTYP 在后面或者前面，继续寻找
-                        continue
-                        
-                    attr_def = AttlibAttrDefinition(attr_hash=attr_id, data_type=data_type, default_flag=default_flag)
-                    self.attr_definitions[attr_id] = attr_def
-                    return attr_def
-        return None
+            n = len(words)
+            # 发现哈希后，其后紧跟的通常是 DTYP；
+            # 过滤掉显然错误的 DTYP (例如大于 10 的值通常是其他数据)，继续寻找后续命中
+            for i, (word, data_type) in enumerate(zip(words, words[1:])):
+                if 1 <= data_type <= 8 and word not in scan_index:
+                    default_flag = words[i + 2] if i + 2 < n else 0
+                    scan_index[word] = (data_type, default_flag)
+
+    def _scan_for_attr(self, attr_id: int) -> Optional[AttlibAttrDefinition]:
+        """最后的手段：在所有已知段和核心页中查找哈希 (查 _build_scan_index 预建的索引)"""
+        entry = self.scan_index.get(attr_id)
+        if entry is None:
+            return None
+        data_type, default_flag = entry
+        attr_def = AttlibAttrDefinition(attr_hash=attr_id, data_type=data_type, default_flag=default_flag)
+        self.attr_definitions[attr_id] = attr_def
+        return attr_def
     
     def close(self) -> None:
-        """关闭文件"""
+        """关闭文件 (加载完成后已自动调用，重复调用无副作用)"""
+        if self.mm:
+            self.mm.close()
+            self.mm = None
         if self.file:
             self.file.close()
+            self.file = None
 
 
 # ============================================================================
@@ -391,18 +505,23 @@ class E3DDatabase:
         self.file_path = file_path
         self.file_size = os.path.getsize(file_path)
         self.metadata = None
+        # 整个数据库只打开并映射一次，按页读取直接切片，不再每页重新 open/seek/read
+        self.file = open(file_path, 'rb')
+        self.mm: Optional[mmap.mmap] = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        # 文件内容不变，属性页列表和按参考号查到的元素 (含未找到) 都只算一次
+        self.attribute_pages: Optional[List[int]] = None
+        self.element_index: Optional[Dict[Tuple[int, int], Tuple[int, int]]] = None
         self._read_metadata()
     
     def _read_metadata(self) -> None:
         """读取数据库元数据"""
-        with open(self.file_path, 'rb') as f:
-            data = f.read(512)
+        version, db_id, page_size, page_count = E3D_HEADER.unpack_from(self.mm, 0)
         
         self.metadata = {
-            'db_id': struct.unpack('>I', data[0x08:0x0C])[0],
-            'version': struct.unpack('>I', data[0x04:0x08])[0],
-            'page_size': struct.unpack('>I', data[0x34:0x38])[0],
-            'page_count': struct.unpack('>I', data[0x38:0x3C])[0],
+            'db_id': db_id,
+            'version': version,
+            'page_size': page_size,
+            'page_count': page_count,
         }
         
         # 启发式检测: 对于 desvir.dat 等旧格式，头部可能不直接给出 2048
@@ -420,44 +539,69 @@ class E3DDatabase:
     def read_page(self, page_num: int) -> bytes:
         """读取指定页"""
         offset = page_num * self.metadata['page_size']
-        with open(self.file_path, 'rb') as f:
-            f.seek(offset)
-            return f.read(self.metadata['page_size'])
+        return self.mm[offset:offset + self.metadata['page_size']]
     
     def parse_page_header(self, page_data: bytes) -> Dict[str, Any]:
         """解析页面头"""
-        page_type = struct.unpack('>I', page_data[0:4])[0]
+        if len(page_data) >= BE_PAGE_HEADER.size:
+            # 类型字与类型 ID 相邻，一次解出
+            page_type, type_id = BE_PAGE_HEADER.unpack_from(page_data, 0)
+        else:
+            page_type, type_id = BE_U32.unpack_from(page_data, 0)[0], None
         result = {'page_type': page_type}
         
         if page_type == 5:  # 数据页面
-            type_id = struct.unpack('>I', page_data[4:8])[0]
+            if type_id is None:
+                type_id = BE_U32.unpack_from(page_data, 4)[0]
             bucket_id = (type_id >> 13) & 0x1FFF
             result['type_id'] = type_id
             result['bucket_id'] = bucket_id
             result['subtype_name'] = DATA_PAGE_SUBTYPES.get(type_id, "未知")
         
+        return result
+    
     def find_attribute_pages(self) -> List[int]:
-        """查找潜在的数据页面"""
-        data_pages = []
+        """查找潜在的数据页面 (首次调用后缓存结果)"""
+        if self.attribute_pages is not None:
+            return self.attribute_pages
         
         # 扫描前 2000 页
         max_scan = min(self.metadata['page_count'], 2000)
-        
-        for page_num in range(max_scan):
-            try:
-                page_data = self.read_page(page_num)
-                if len(page_data) < 4: continue
-                
-                page_type = struct.unpack('>I', page_data[0:4])[0]
-                # 在旧版中，数据页类型可能是 1 (RefArray) 或 5 (Data)
-                # 元素头往往出现在这些页面中
-                if page_type in [1, 5]:
-                    data_pages.append(page_num)
-            except Exception:
-                continue
+        self._advise_sequential(max_scan * self.metadata['page_size'])
+        
+        page_size = self.metadata['page_size']
+        file_len = len(self.mm)
+        # 页首类型字完整落在文件内的页数
+        usable = min(max_scan, (file_len - 4) // page_size + 1) if file_len >= 4 else 0
+        if usable <= 0:
+            self.attribute_pages = []
+            return self.attribute_pages
+        
+        # 只需要各页首的类型字: 在映射上按页步长取出全部类型字，一次复制成 u32 数组，不逐页解包
+        end = (usable - 1) * page_size + 4
+        with memoryview(self.mm) as mv, mv[:end] as head, head.cast('I') as words, \
+                words[::page_size // 4] as type_words:
+            page_types = array('I', type_words.tobytes())
+        if sys.byteorder == 'little':
+            page_types.byteswap()
+        
+        # 在旧版中，数据页类型可能是 1 (RefArray) 或 5 (Data)
+        # 元素头往往出现在这些页面中
+        data_pages = [page_num for page_num, page_type in enumerate(page_types)
+                      if page_type == 1 or page_type == 5]
                 
+        self.attribute_pages = data_pages
         return data_pages
     
+    def _advise_sequential(self, span: int) -> None:
+        """提示内核将顺序读取映射的前 span 字节，提前大块预读 (平台不支持时跳过)"""
+        span = min(span, len(self.mm))
+        if span <= 0:
+            return
+        for advice in ('MADV_SEQUENTIAL', 'MADV_WILLNEED'):
+            if hasattr(mmap, advice):
+                self.mm.madvise(getattr(mmap, advice), 0, span)
+    
     def get_element_data_by_ref(self, ref_no: str) -> Optional[Tuple[int, bytes]]:
         """
         通过参考号获取元素原始数据
@@ -475,29 +619,55 @@ class E3DDatabase:
             print(f"警告: 无效的参考号格式: {ref_no}")
             return None
             
-        # 查找包含此参考号的属性数据页面
-        # 注意: 真正的引用解析是通过 B+ 树索引完成的，这里为了演示先扫描属性页面
-        attr_pages = self.find_attribute_pages()
+        # 注意: 真正的引用解析是通过 B+ 树索引完成的，磁盘上的树结构尚未逆向清楚，
+        # 这里对属性数据页面建一次内存索引代替逐页扫描
+        location = self._build_element_index().get((db_id, local_id))
+        if location is None:
+            return None
+        
+        page_num, i = location
+        page_data = self.read_page(page_num)
+        noun_id = BE_U32.unpack_from(page_data, i + 8)[0]
+        # 找到了！
+        # 真正的实现需要计算元素数据块的长度，这里我们返回整个页面的剩余部分
+        # 为了支持偏移量正确，我们需要返回一个从元素头开始的 bytearray
+        return noun_id, page_data[i:]
+    
+    def _build_element_index(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        遍历全部属性数据页面一次，建立 (Ref0, Ref1) -> (页号, 字节偏移) 索引
         
-        for page_num in attr_pages:
+        元素头部为 [Ref0, Ref1, NounID]: 只收录 4 字节对齐、三个字完整落在页内、
+        且 NounID 看起来合理 (通常 < 1000，这里放宽到 < 2000) 的位置。
+        Ref0 (数据库号) 为 0 的位置是填充字，不收录，避免全零填充区把索引撑大。
+        同一参考号出现多次时保留页面顺序和页内顺序中的第一个。
+        """
+        if self.element_index is not None:
+            return self.element_index
+        
+        index: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        # find_attribute_pages 已对整个扫描区间做过 MADV_SEQUENTIAL/WILLNEED 预读
+        for page_num in self.find_attribute_pages():
             page_data = self.read_page(page_num)
+            words = array('I', page_data[:len(page_data) // 4 * 4])
+            if sys.byteorder == 'little':
+                words.byteswap()
             
-            # 搜索参考号匹配的元素头部: [Ref0, Ref1, NounID]
-            # 为了更鲁棒，我们在页面内逐字搜索
-            for i in range(0, len(page_data) - 12, 4):
-                ref0 = struct.unpack('>I', page_data[i:i+4])[0]
-                ref1 = struct.unpack('>I', page_data[i+4:i+8])[0]
-                
-                if ref0 == db_id and ref1 == local_id:
-                    # 检查下一个词是否像 NounID (通常 < 1000)
-                    noun_id = struct.unpack('>I', page_data[i+8:i+12])[0]
-                    if noun_id < 2000:
-                        # 找到了！
-                        # 真正的实现需要计算元素数据块的长度，这里我们返回整个页面的剩余部分
-                        # 为了支持偏移量正确，我们需要返回一个从元素头开始的 bytearray
-                        return noun_id, page_data[i:]
-                    
-        return None
+            header_count = max(0, (len(page_data) - 9) // 4)  # 满足 i * 4 < len - 12 的位置数
+            for i, (ref0, ref1, noun_id) in enumerate(zip(words, words[1:], words[2:2 + header_count])):
+                if noun_id < 2000 and ref0:
+                    index.setdefault((ref0, ref1), (page_num, i * 4))
+        
+        self.element_index = index
+        return index
+    
+    def close(self) -> None:
+        """关闭文件"""
+        if self.mm:
+            self.mm.close()
+            self.mm = None
+        if self.file:
+            self.file.close()
 
 
 # ============================================================================
@@ -551,15 +721,12 @@ class E3DAttributeParser:
         # 3. 查找偏移 (如果提供了 noun_id)
         offset = 0
         if noun_id is not None:
-            for binding in self.data_source.noun_attr_bindings:
-                if binding.noun_id == noun_id and binding.attr_id == attr_id:
-                    offset = binding.offset
-                    break
+            offset = self.data_source.binding_offsets.get((noun_id, attr_id), 0)
         
         # 4. 构造元数据并缓存
         metadata = AttributeMetadata(
             attr_id=attr_id,
-            data_type=DataType(attr_def.data_type) if attr_def.data_type in DataType._value2member_map_ else DataType.UNKNOWN,
+            data_type=DATA_TYPE_BY_VALUE.get(attr_def.data_type, DataType.UNKNOWN),
             offset=offset,
             length=self._get_type_length(attr_def.data_type)
         )
@@ -636,38 +803,7 @@ class E3DAttributeParser:
         if offset >= len(page_data):
             return None
         
-        if data_type == DataType.LOGICAL:
-            value = struct.unpack('>I', page_data[offset:offset+4])[0]
-            return bool(value)
-        
-        elif data_type == DataType.INTEGER:
-            return struct.unpack('>i', page_data[offset:offset+4])[0]
-        
-        elif data_type == DataType.REAL:
-            return struct.unpack('>f', page_data[offset:offset+4])[0]
-        
-        elif data_type == DataType.REFERENCE:
-            return struct.unpack('>I', page_data[offset:offset+4])[0]
-        
-        elif data_type == DataType.POSITION or data_type == DataType.DIRECTION:
-            x = struct.unpack('>f', page_data[offset:offset+4])[0]
-            y = struct.unpack('>f', page_data[offset+4:offset+8])[0]
-            z = struct.unpack('>f', page_data[offset+8:offset+12])[0]
-            return (x, y, z)
-        
-        elif data_type == DataType.TEXT:
-            # 文本格式: 4字节长度 + 内容
-            length = struct.unpack('>I', page_data[offset:offset+4])[0]
-            text_data = page_data[offset+4:offset+4+length*4]
-            # 将 32-bit words 转换为字符串
-            chars = []
-            for i in range(0, len(text_data), 4):
-                word = struct.unpack('>I', text_data[i:i+4])[0]
-                chars.append(chr(word) if 32 <= word < 127 else '?')
-            return ''.join(chars)
-        
-        else:
-            return struct.unpack('>I', page_data[offset:offset+4])[0]
+        return ATTRIBUTE_VALUE_READERS.get(data_type, _read_u32)(page_data, offset)
     
     def get_all_attr_definitions(self) -> Dict[int, AttlibAttrDefinition]:
         """获取所有属性定义"""
@@ -679,7 +815,7 @@ class E3DAttributeParser:
         print("E3D 属性解析器摘要")
         print("=" * 80)
         print(f"属性定义数: {len(self.data_source.attr_definitions)}")
-        print(f"缓存大小: {len(self.cache.cache)}/{self.cache.max_entries}")
+        print(f"缓存大小: {len(self.cache)}/{self.cache.max_entries}")
         
         if self.database:
             print(f"\n数据库: {self.database.file_path}")
@@ -687,9 +823,7 @@ class E3DAttributeParser:
             print(f"  总页数: {self.database.metadata['page_count']}")
         
         # 按数据类型统计
-        type_counts: Dict[int, int] = {}
-        for attr in self.data_source.attr_definitions.values():
-            type_counts[attr.data_type] = type_counts.get(attr.data_type, 0) + 1
+        type_counts = Counter(attr.data_type for attr in self.data_source.attr_definitions.values())
         
         print("\n属性类型分布:")
         type_names = {1: "LOG", 2: "REAL", 3: "INT", 4: "TEXT", 5: "REF"}
@@ -700,6 +834,8 @@ class E3DAttributeParser:
     def close(self) -> None:
         """关闭资源"""
         self.data_source.close()
+        if self.database:
+            self.database.close()
 
 
 # ============================================================================
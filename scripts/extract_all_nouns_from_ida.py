@@ -53,33 +53,20 @@ aNounCyli3qbvdb
 aNounDamp3qbvdb
 """
 
+# 每行一个 aNoun 字符串: 组 1 为整行 (去除首尾空白)，组 2 为名称部分 (大写字母 + 小写字母串)
+NOUN_STRING_RE = re.compile(r'^\s*(aNoun([A-Z][a-z]+).*?)\s*$', re.MULTILINE)
+
 def extract_noun_names(noun_strings: str) -> dict:
     """从 IDA Pro 字符串中提取 Noun 名称"""
     
-    nouns = {}
-    lines = [line.strip() for line in noun_strings.strip().split('\n') if line.strip()]
-    
-    for line in lines:
-        # 提取 Noun 名称：aNoun{NAME}3qbv...
-        # 模式：aNoun + 大写字母开头的名称 + 3qbv
-        match = re.match(r'aNoun([A-Z][a-z]{2,}).*', line)
-        if match:
-            noun_name = match.group(1).upper()
-            nouns[noun_name] = {
-                'string_name': line,
-                'identified': True
-            }
-        else:
-            # 如果是特殊格式（如 aNounCap3qbvdbN）
-            match2 = re.match(r'aNoun([A-Z][a-z]{1,3}).*', line)
-            if match2:
-                noun_name = match2.group(1).upper()
-                nouns[noun_name] = {
-                    'string_name': line,
-                    'identified': True
-                }
-    
-    return nouns
+    # 提取 Noun 名称：aNoun{NAME}3qbv...，对整段文本一次 findall
+    return {
+        noun_name.upper(): {
+            'string_name': line,
+            'identified': True
+        }
+        for line, noun_name in NOUN_STRING_RE.findall(noun_strings)
+    }
 
 def generate_complete_noun_list(output_path: str):
     """生成完整的 Noun 列表"""
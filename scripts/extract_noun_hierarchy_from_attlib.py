@@ -13,6 +13,83 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from collections import defaultdict
 
+# 预编译的大端序解包器: 整页 512 个字 / 段指针表 8 个字各一次 C 调用解出
+PAGE_STRUCT = struct.Struct('>512I')
+SECTION_POINTERS_STRUCT = struct.Struct('>8I')
+
+BASE27_CHARS = " ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# 高位在前的两位 27 进制组合表: BASE27_PAIRS_HIGH_FIRST[d1 * 27 + d0] == BASE27_CHARS[d1] + BASE27_CHARS[d0]
+BASE27_PAIRS_HIGH_FIRST = [a + b for a in BASE27_CHARS for b in BASE27_CHARS]
+
+# 扩展的 Noun hash 到名称的映射 (基于 PDMS/E3D 标准)，模块加载时构建一次
+KNOWN_NOUNS = {
+    # 核心层级类型
+    564937: "WORL",      # 世界/数据库
+    631900: "SITE",      # 站点/工厂
+    724361: "ZONE",      # 区域
+    907462: "EQUI",      # 设备
+    958465: "PIPE",      # 管道
+    900968: "BRAN",      # 分支
+    
+    # 管道构件
+    640493: "ELBO",      # 弯头
+    621502: "VALV",      # 阀门
+    779672: "FLAN",      # 法兰
+    640105: "GASK",      # 垫片
+    862086: "TEE",       # 三通
+    808220: "REDU",      # 异径管
+    890182: "CAP",       # 管帽
+    739306: "COUP",      # 管接头
+    621505: "OLET",      # 支管台
+    821683: "BEND",      # 弯管
+    581519: "WELD",      # 焊缝
+    679463: "ATTA",      # 附件
+    718014: "INST",      # 仪表
+    
+    # 结构类型
+    619079: "STRU",      # 结构
+    897228: "FRMW",      # 框架
+    931840: "PANE",      # 面板
+    10403889: "BEAM",    # 梁
+    559969: "COLU",      # 柱
+    3471220: "SLAB",     # 板
+    
+    # 设备分类
+    912101: "PRES",      # 压力容器
+    549344: "HEAT",      # 换热器
+    713035: "PUMP",      # 泵
+    713316: "CMPR",      # 压缩机
+    661557: "TURB",      # 涡轮
+    7146286: "FILT",     # 过滤器
+    929085: "SEPA",      # 分离器
+    641779: "TANK",      # 储罐
+    620516: "VESS",      # 容器
+    900977: "TOWE",     # 塔
+    
+    # 电气类型
+    643214: "CABL",      # 电缆
+    312510290: "COND",   # 导管
+    897213: "JUNC",      # 接线盒
+    717396: "LIGH",      # 灯具
+    
+    # HVAC 类型
+    711154: "DUCT",      # 风管
+    602740: "FITT",      # 管件
+    621602: "DAMP",      # 风阀
+    108608856: "GRILLE", # 格栅
+    312510247: "DIFF",   # 散流器
+    
+    # 其他常见类型
+    269723131: "SUBS",   # 子系统
+    5177808: "GROU",     # 组
+    833646: "ITEM",      # 项目
+    623975: "SPEC",      # 规格
+    968612: "CATA",      # 目录
+    904406: "TEXT",      # 文本
+    938782: "DRAW",      # 图纸
+    535241: "SYMB",      # 符号
+}
+
 class AttlibNounHierarchyExtractor:
     """从 attlib.dat 提取 Noun 层级关系"""
     
@@ -26,49 +103,32 @@ class AttlibNounHierarchyExtractor:
         self.noun_parent_map = defaultdict(set)  # child_hash -> set(parent_hashes)
         self.noun_child_map = defaultdict(set)   # parent_hash -> set(child_hashes)
         
-    def read_page(self, file, page_num: int) -> List[int]:
+    def read_page(self, file, page_num: int) -> Tuple[int, ...]:
         """读取指定页的数据 (FHDBRN 风格)"""
         offset = page_num * self.page_size
         file.seek(offset)
         data = file.read(self.page_size)
         
         if len(data) < self.page_size:
-            return []
+            return ()
         
-        # 大端序读取 512 个 32 位字
-        words = []
-        for i in range(self.words_per_page):
-            word_bytes = data[i*4:(i+1)*4]
-            word = struct.unpack('>I', word_bytes)[0]
-            words.append(word)
-        
-        return words
+        # 大端序读取 512 个 32 位字 (调用方只读，直接返回 unpack 得到的 tuple)
+        return PAGE_STRUCT.unpack_from(data)
     
-    def read_section_pointers(self, file) -> List[int]:
+    def read_section_pointers(self, file) -> Tuple[int, ...]:
         """读取段指针表 (offset 0x0800)"""
         file.seek(0x0800)
-        pointers = []
-        for i in range(8):
-            ptr_bytes = file.read(4)
-            ptr = struct.unpack('>I', ptr_bytes)[0]
-            pointers.append(ptr // self.page_size)  # 转换为页号
-        return pointers
+        raw = file.read(SECTION_POINTERS_STRUCT.size)
+        return tuple(ptr // self.page_size for ptr in SECTION_POINTERS_STRUCT.unpack_from(raw))  # 转换为页号
     
     def decode_27_base(self, encoded_words: List[int]) -> str:
         """解码 27 进制编码的文本"""
-        result = []
-        base27_chars = " ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        
-        for word in encoded_words:
-            # 每个 32 位字包含多个 27 进制字符
-            chars = []
-            temp = word
-            for _ in range(6):  # 最多 6 个字符每个字
-                chars.append(base27_chars[temp % 27])
-                temp //= 27
-            result.extend(reversed(chars))
-        
-        return ''.join(result).strip()
+        # 每个 32 位字取低 6 位 27 进制数字 (高位在前)，三次查两位组合表拼出
+        pairs = BASE27_PAIRS_HIGH_FIRST
+        return ''.join(
+            pairs[word // 531441 % 729] + pairs[word // 729 % 729] + pairs[word % 729]
+            for word in encoded_words
+        ).strip()
     
     def extract_noun_definitions(self, file, all_attr_info: dict) -> Dict[int, str]:
         """从 all_attr_info.json 提取所有 Noun 类型定义"""
@@ -95,77 +155,7 @@ class AttlibNounHierarchyExtractor:
     
     def decode_noun_name(self, noun_hash: int) -> str:
         """根据 hash 解码 Noun 名称 (需要查找表)"""
-        # 扩展的 Noun hash 到名称的映射 (基于 PDMS/E3D 标准)
-        known_nouns = {
-            # 核心层级类型
-            564937: "WORL",      # 世界/数据库
-            631900: "SITE",      # 站点/工厂
-            724361: "ZONE",      # 区域
-            907462: "EQUI",      # 设备
-            958465: "PIPE",      # 管道
-            900968: "BRAN",      # 分支
-            
-            # 管道构件
-            640493: "ELBO",      # 弯头
-            621502: "VALV",      # 阀门
-            779672: "FLAN",      # 法兰
-            640105: "GASK",      # 垫片
-            862086: "TEE",       # 三通
-            808220: "REDU",      # 异径管
-            890182: "CAP",       # 管帽
-            739306: "COUP",      # 管接头
-            621505: "OLET",      # 支管台
-            821683: "BEND",      # 弯管
-            581519: "WELD",      # 焊缝
-            679463: "ATTA",      # 附件
-            718014: "INST",      # 仪表
-            
-            # 结构类型
-            619079: "STRU",      # 结构
-            897228: "FRMW",      # 框架
-            931840: "PANE",      # 面板
-            10403889: "BEAM",    # 梁
-            559969: "COLU",      # 柱
-            3471220: "SLAB",     # 板
-            
-            # 设备分类
-            912101: "PRES",      # 压力容器
-            549344: "HEAT",      # 换热器
-            713035: "PUMP",      # 泵
-            713316: "CMPR",      # 压缩机
-            661557: "TURB",      # 涡轮
-            7146286: "FILT",     # 过滤器
-            929085: "SEPA",      # 分离器
-            641779: "TANK",      # 储罐
-            620516: "VESS",      # 容器
-            900977: "TOWE",     # 塔
-            
-            # 电气类型
-            643214: "CABL",      # 电缆
-            312510290: "COND",   # 导管
-            897213: "JUNC",      # 接线盒
-            973264: "PANE",      # 配电盘
-            717396: "LIGH",      # 灯具
-            
-            # HVAC 类型
-            711154: "DUCT",      # 风管
-            602740: "FITT",      # 管件
-            621602: "DAMP",      # 风阀
-            108608856: "GRILLE", # 格栅
-            312510247: "DIFF",   # 散流器
-            
-            # 其他常见类型
-            269723131: "SUBS",   # 子系统
-            5177808: "GROU",     # 组
-            833646: "ITEM",      # 项目
-            623975: "SPEC",      # 规格
-            968612: "CATA",      # 目录
-            904406: "TEXT",      # 文本
-            938782: "DRAW",      # 图纸
-            535241: "SYMB",      # 符号
-        }
-        
-        return known_nouns.get(noun_hash, f"NOUN_{noun_hash}")
+        return KNOWN_NOUNS.get(noun_hash) or f"NOUN_{noun_hash}"
     
     def analyze_owner_relationships(self, all_attr_info: dict):
         """分析 Noun 之间的 OWNER 关系"""
@@ -204,12 +194,14 @@ class AttlibNounHierarchyExtractor:
                 'parent_child_relations': []
             }
             
+            # 每个节点只解码一次名称，边的处理按下标直接取用
+            node_names = [self.decode_noun_name(node_hash) for node_hash in nodes]
+            
             # 构建节点映射
             for i, node_hash in enumerate(nodes):
-                node_name = self.decode_noun_name(node_hash)
                 hierarchy['nodes'][node_hash] = {
                     'hash': node_hash,
-                    'name': node_name,
+                    'name': node_names[i],
                     'index': i
                 }
             
@@ -222,9 +214,9 @@ class AttlibNounHierarchyExtractor:
                     
                     hierarchy['parent_child_relations'].append({
                         'parent': parent_hash,
-                        'parent_name': self.decode_noun_name(parent_hash),
+                        'parent_name': node_names[parent_idx],
                         'child': child_hash,
-                        'child_name': self.decode_noun_name(child_hash),
+                        'child_name': node_names[child_idx],
                         'edge_type': edge_type
                     })
             
@@ -240,90 +232,78 @@ class AttlibNounHierarchyExtractor:
         if not graph_data:
             return self._get_standard_hierarchy()
         
-        # 支持两种数据格式
+        # 支持两种数据格式: 先判定格式，再交给对应的专用构建函数
         if 'nodes' in graph_data and 'parent_child_relations' in graph_data:
             # 从 extract_hierarchy_from_graph 返回的格式
-            nodes_dict = graph_data['nodes']
             relations = graph_data['parent_child_relations']
             
-            # 构建父子关系
-            hierarchy_by_hash = defaultdict(set)
-            hierarchy_by_name = defaultdict(set)
-            
             print(f"📊 从图数据构建层级关系...")
-            print(f"   节点数: {len(nodes_dict)}")
+            print(f"   节点数: {len(graph_data['nodes'])}")
             print(f"   关系数: {len(relations)}")
             
-            for relation in relations:
-                parent_hash = relation['parent']
-                child_hash = relation['child']
-                parent_name = relation['parent_name']
-                child_name = relation['child_name']
-                
-                hierarchy_by_hash[parent_hash].add(child_hash)
-                hierarchy_by_name[parent_name].add(child_name)
-            
-            # 转换为列表
-            hierarchy_by_hash_list = {
-                str(k): list(v) for k, v in hierarchy_by_hash.items()
-            }
-            hierarchy_by_name_list = {
-                k: sorted(list(v)) for k, v in hierarchy_by_name.items()
-            }
+            hierarchy_by_hash, hierarchy_by_name = self._build_from_relations(relations)
+        elif 'nodes' in graph_data and 'edges' in graph_data:
+            # 原始 noun_graph.json 格式
+            nodes = graph_data['nodes']
+            edges = graph_data['edges']
             
-            print(f"✅ 构建完成: {len(hierarchy_by_name_list)} 个父类型")
+            print(f"📊 从图数据构建层级关系...")
+            print(f"   节点数: {len(nodes)}")
+            print(f"   边数: {len(edges)}")
             
-            return {
-                'by_hash': hierarchy_by_hash_list,
-                'by_name': hierarchy_by_name_list
-            }
-        
-        # 原始 noun_graph.json 格式
-        if 'nodes' not in graph_data or 'edges' not in graph_data:
+            hierarchy_by_hash, hierarchy_by_name = self._build_from_edges(nodes, edges)
+        else:
             return self._get_standard_hierarchy()
         
-        nodes = graph_data['nodes']
-        edges = graph_data['edges']
+        # 转换为列表以便 JSON 序列化 (hash 键保持 int，json 编码时会自动转成字符串键)
+        hierarchy_by_hash_list = {
+            k: list(v) for k, v in hierarchy_by_hash.items()
+        }
+        hierarchy_by_name_list = {
+            k: sorted(v) for k, v in hierarchy_by_name.items()
+        }
         
-        # 构建父子关系映射
+        print(f"✅ 构建完成: {len(hierarchy_by_name_list)} 个父类型")
+        
+        return {
+            'by_hash': hierarchy_by_hash_list,
+            'by_name': hierarchy_by_name_list
+        }
+    
+    @staticmethod
+    def _build_from_relations(relations: List[Dict]) -> Tuple[Dict, Dict]:
+        """由 parent_child_relations 列表构建 (父 hash -> 子 hash 集合, 父名称 -> 子名称集合)"""
         hierarchy_by_hash = defaultdict(set)
         hierarchy_by_name = defaultdict(set)
         
-        print(f"📊 从图数据构建层级关系...")
-        print(f"   节点数: {len(nodes)}")
-        print(f"   边数: {len(edges)}")
+        for relation in relations:
+            hierarchy_by_hash[relation['parent']].add(relation['child'])
+            hierarchy_by_name[relation['parent_name']].add(relation['child_name'])
+        
+        return hierarchy_by_hash, hierarchy_by_name
+    
+    def _build_from_edges(self, nodes: List[int], edges: List[List[int]]) -> Tuple[Dict, Dict]:
+        """由原始 nodes/edges 构建 (父 hash -> 子 hash 集合, 父名称 -> 子名称集合)"""
+        hierarchy_by_hash = defaultdict(set)
+        hierarchy_by_name = defaultdict(set)
+        
+        # 每个节点只解码一次名称，边的处理按下标直接取用
+        node_names = [self.decode_noun_name(node_hash) for node_hash in nodes]
+        node_count = len(nodes)
         
         for edge in edges:
             if len(edge) < 2:
                 continue
             parent_idx, child_idx = edge[0], edge[1]
             
-            if parent_idx < len(nodes) and child_idx < len(nodes):
-                parent_hash = nodes[parent_idx]
-                child_hash = nodes[child_idx]
-                
+            if parent_idx < node_count and child_idx < node_count:
                 # 使用 hash 构建
-                hierarchy_by_hash[parent_hash].add(child_hash)
+                hierarchy_by_hash[nodes[parent_idx]].add(nodes[child_idx])
                 
                 # 转换为名称
-                parent_name = self.decode_noun_name(parent_hash)
-                child_name = self.decode_noun_name(child_hash)
-                hierarchy_by_name[parent_name].add(child_name)
-        
-        # 转换为列表以便 JSON 序列化
-        hierarchy_by_hash_list = {
-            str(k): list(v) for k, v in hierarchy_by_hash.items()
-        }
-        hierarchy_by_name_list = {
-            k: sorted(list(v)) for k, v in hierarchy_by_name.items()
-        }
+                hierarchy_by_name[node_names[parent_idx]].add(node_names[child_idx])
         
-        print(f"✅ 构建完成: {len(hierarchy_by_name_list)} 个父类型")
-        
-        return {
-            'by_hash': hierarchy_by_hash_list,
-            'by_name': hierarchy_by_name_list
-        }
+        return hierarchy_by_hash, hierarchy_by_name
     
     def _get_standard_hierarchy(self) -> Dict:
         """获取标准 PDMS 层级结构（回退方案）"""
@@ -1,32 +1,60 @@
+import mmap
 import struct
+import sys
 import json
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+from attlib_io import decode_base27_or_unk, find_aligned_words
 
 ATTLIB_PATH = "/Volumes/DPC/work/plant-code/aios-parse-pdms-fork/data/attlib.dat"
 PAGE_SIZE = 2048
 DATA_REGION_START = 0x1000
 SEGMENT_POINTERS_OFFSET = 0x0800
+SEGMENT_POINTERS_STRUCT = struct.Struct(">8I")
 
+# 纯函数且同一 hash 反复出现 (同一属性绑定在多个 Noun 上)，结果按 hash 缓存
+@lru_cache(maxsize=4096)
 def decode_base27(hash_val):
-    BASE27_OFFSET = 0x81BF1
-    if hash_val < 531442: return f"unk_{hash_val}"
-    k = hash_val - BASE27_OFFSET
-    chars = []
-    while k > 0:
-        c = k % 27
-        if c == 0: chars.append(' ')
-        else: chars.append(chr(c + 64))
-        k //= 27
-    return "".join(chars)
+    # 共用的查表解码 (每次取两位 27 进制字符)，无效值返回 unk_<值>
+    return decode_base27_or_unk(hash_val)
+
+def parse_atnain(all_words, start_page, end_page):
+    """解析 ATNAIN 段 [start_page, end_page)，返回 {NounID: {AttrID: Offset}}"""
+    bindings = {}
+    for p in range(start_page, end_page):
+        base = p * 512
+        # 三元组 (AttrID, NounID, Offset) 按列切片，AttrID 列在首个 0xFFFFFFFF 处截断
+        attr_ids = all_words[base : base + 510 : 3]
+        if 0xFFFFFFFF in attr_ids:
+            attr_ids = attr_ids[:attr_ids.index(0xFFFFFFFF)]
+        noun_ids = all_words[base + 1 : base + 511 : 3]
+        offsets = all_words[base + 2 : base + 512 : 3]
+        
+        for attr_id, noun_id, offset in zip(attr_ids, noun_ids, offsets):
+            # attr_id == 0 的空槽同样被这里的下限过滤
+            if attr_id >= 531442:
+                if noun_id not in bindings: bindings[noun_id] = {}
+                bindings[noun_id][attr_id] = offset
+    return bindings
 
 def analyze():
-    with open(ATTLIB_PATH, "rb") as f:
-        f.seek(SEGMENT_POINTERS_OFFSET)
-        ptrs = struct.unpack(">8I", f.read(32))
+    # 只读映射整个文件: 段指针和锚点搜索直接在映射上进行，数据区只复制一次到 u32 数组
+    with open(ATTLIB_PATH, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        ptrs = SEGMENT_POINTERS_STRUCT.unpack_from(mm, SEGMENT_POINTERS_OFFSET)
         
         # 加载所有数据 Word
-        f.seek(DATA_REGION_START)
-        raw_data = f.read()
-        all_words = struct.unpack(f">{len(raw_data)//4}I", raw_data)
+        data_end = DATA_REGION_START + (len(mm) - DATA_REGION_START) // 4 * 4
+        all_words = array("I")
+        with memoryview(mm) as mv, mv[DATA_REGION_START:data_end] as data_region:
+            all_words.frombytes(data_region)
+        if sys.byteorder == "little":
+            all_words.byteswap()
+
+        # 一次线性扫描找出所有 [1, 1, 1] 起点和 POS 命中，避免对每个命中回扫 50 个 word
+        triple_starts = find_aligned_words(mm, struct.pack(">3I", 1, 1, 1), DATA_REGION_START)
+        pos_hits = find_aligned_words(mm, struct.pack(">I", 545713), DATA_REGION_START)
 
     # 1. 建立 NounID -> NounName 映射
     # 策略: 搜索 [1, 1, 1, NameHash, count, OffsetInAnotherSegment, 1, AttrHash1, AttrHash2, ...] 模式
@@ -34,17 +62,16 @@ def analyze():
     
     noun_id_to_hash = {}
     # 基于 generate_attr_info_v2.py 的逻辑
-    for i in range(len(all_words) - 10):
+    for i in pos_hits:
+        if i >= len(all_words) - 10: break
         # POS(545713) 常作为第一个或核心属性
-        if all_words[i] == 545713 and 0 < all_words[i+1] < 2000:
+        if 0 < all_words[i+1] < 2000:
             noun_id = all_words[i+1]
             # 向上找 NounHash。通常 Noun 定义在前面。
-            # 这是一个启发式搜索
-            for j in range(max(0, i-50), i):
-                if all_words[j] == 1 and all_words[j+1] == 1 and all_words[j+2] == 1:
-                    noun_hash = all_words[j+3]
-                    noun_id_to_hash[noun_id] = noun_hash
-                    break
+            # 这是一个启发式搜索: 取窗口 [i-50, i) 内最早的 [1, 1, 1]
+            k = bisect_left(triple_starts, max(0, i-50))
+            if k < len(triple_starts) and triple_starts[k] < i:
+                noun_id_to_hash[noun_id] = all_words[triple_starts[k] + 3]
 
     print(f"建立 NounID 映射: 已找到 {len(noun_id_to_hash)} 个对应关系")
     if 907 in noun_id_to_hash:
@@ -57,20 +84,7 @@ def analyze():
     atnain_start = ptrs[3]
     atnain_end = ptrs[4]
     
-    bindings = {}
-    for p in range(atnain_start, atnain_end):
-        p_words = all_words[p*512 : (p+1)*512]
-        for i in range(0, 512-2, 3):
-            attr_id = p_words[i]
-            noun_id = p_words[i+1]
-            offset = p_words[i+2]
-            
-            if attr_id == 0: continue
-            if attr_id == 0xFFFFFFFF: break
-            
-            if attr_id >= 531442:
-                if noun_id not in bindings: bindings[noun_id] = {}
-                bindings[noun_id][attr_id] = offset
+    bindings = parse_atnain(all_words, atnain_start, atnain_end)
 
     # 3. 输出汇总
     report = {}
@@ -7,17 +7,24 @@ generate_attr_info.py - 从 attlib.dat 生成 all_attr_info.json
 2. attlib.dat Segment 3 (ATNAIN) 包含 [AttrID, NounID, Offset] 绑定
 3. 属性名称从现有 all_attr_info.json 加载（反向映射）
 """
+import mmap
 import struct
 import json
 import sys
+from array import array
+from bisect import bisect_left
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+
+from attlib_io import find_aligned_words
 
 # Constants
 ATTLIB_PAGE_SIZE = 2048
 ATTLIB_WORDS_PER_PAGE = 512
 ATTLIB_DATA_REGION_START = 0x1000
 ATTLIB_SEGMENT_POINTERS_OFFSET = 0x0800
+ATTLIB_SEGMENT_POINTERS_STRUCT = struct.Struct('>8I')
 ATTLIB_PAGE_SWITCH_MARK = 0xFFFFFFFF
 ATTLIB_SEGMENT_END_MARK = 0xFFFFFFFE
 ATTLIB_MIN_HASH = 100000
@@ -50,6 +57,8 @@ DEFAULT_VALUES = {
     "INTVEC": {"IntArrayType": []},
 }
 
+# 纯函数，POS/ORI 等公共属性在各 Noun 间反复出现，结果按 hash 缓存
+@lru_cache(maxsize=None)
 def decode_base27(hash_val):
     BASE27_OFFSET = 0x81BF1
     if hash_val < 531442: return f"unk_{hash_val}"
@@ -73,7 +82,7 @@ class AttlibParser:
         self.attlib_path = attlib_path
         self.ref_json_path = ref_json_path
         self.file = None
-        self.words: List[int] = []
+        self.words: array = array('I')
         self.segment_pointers: List[int] = []
         self.hash_to_name: Dict[int, str] = {}
         self.hash_to_type: Dict[int, str] = {}
@@ -84,16 +93,17 @@ class AttlibParser:
         if self.ref_json_path:
             self._load_reference_names()
         
-        with open(self.attlib_path, 'rb') as f:
-            f.seek(ATTLIB_SEGMENT_POINTERS_OFFSET)
-            for _ in range(8):
-                data = f.read(4)
-                if len(data) == 4:
-                    self.segment_pointers.append(struct.unpack('>I', data)[0])
+        # 只读映射文件: 段指针直接从映射解包，数据区只复制一次到 u32 数组，不再经过 f.read() 的中间 bytes
+        with open(self.attlib_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            self.segment_pointers = list(ATTLIB_SEGMENT_POINTERS_STRUCT.unpack_from(mm, ATTLIB_SEGMENT_POINTERS_OFFSET))
             
-            f.seek(ATTLIB_DATA_REGION_START)
-            data = f.read()
-            self.words = list(struct.unpack(f'>{len(data)//4}I', data))
+            # 整段读入 u32 数组 (大端序)，不再为每个 word 构造装箱 int 的元组和列表
+            data_end = ATTLIB_DATA_REGION_START + (len(mm) - ATTLIB_DATA_REGION_START) // 4 * 4
+            self.words = array('I')
+            with memoryview(mm) as mv, mv[ATTLIB_DATA_REGION_START:data_end] as data:
+                self.words.frombytes(data)
+            if sys.byteorder == 'little':
+                self.words.byteswap()
         
         print(f"Segment Pointers: {self.segment_pointers}")
         print(f"Total words: {len(self.words)}")
@@ -123,56 +133,56 @@ class AttlibParser:
         self._load_atnain()
         
         # 记录已扫描出的 Hash
-        i = 0
-        while i < len(self.words) - 20:
-            if self.words[i] == 1 and self.words[i+1] == 1 and self.words[i+2] == 1:
-                # Check for 5-ones (PIPE style): 1,1,1, 1,1, Hash
-                is_five_ones = False
-                if self.words[i+3] == 1 and self.words[i+4] == 1:
-                    is_five_ones = True
-                
-                type_hash = 0
-                count = 0
-                attr_start_idx = 0
-                
-                if is_five_ones:
-                    # Pattern: 1,1,1,1,1, Type(i+5), ?(i+6), Count(i+7), ?(i+8), Attrs(i+9...)
-                    type_hash = self.words[i+5]
-                    count = self.words[i+7]
-                    attr_start_idx = i + 9
-                else:
-                    # Pattern: 1,1,1, Type(i+3), Count(i+4), ?, ?, Attrs(i+7...)
-                    type_hash = self.words[i+3]
-                    count = self.words[i+4]
-                    attr_start_idx = i + 7 # Based on prev code
-                
-                if ATTLIB_MIN_HASH <= type_hash <= ATTLIB_MAX_HASH and 0 < count < 5000:
-                    if type_hash not in self.noun_definitions:
-                        attr_hashes = []
-                        curr = attr_start_idx
-                        # Collect next 'count' VALID hashes?
-                        # Or assume contiguous block?
-                        # PIPE has clean list.
-                        added = 0
-                        # Scan a bit more than count to skip small ints?
-                        for k in range(min(count * 2, 5000)):
-                            if curr >= len(self.words): break
-                            if added >= count: break
-                            
-                            h = self.words[curr]
-                            if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH:
-                                attr_hashes.append(h)
-                                added += 1
-                            curr += 1
+        # 先用 bytes.find 一次定位所有 [1,1,1] 起点，只对这些位置做模式判断，不再逐 word 走解释器循环
+        for i in find_aligned_words(self.words.tobytes(), array('I', [1, 1, 1]).tobytes()):
+            if i >= len(self.words) - 20:
+                break
+            # Check for 5-ones (PIPE style): 1,1,1, 1,1, Hash
+            is_five_ones = False
+            if self.words[i+3] == 1 and self.words[i+4] == 1:
+                is_five_ones = True
+            
+            type_hash = 0
+            count = 0
+            attr_start_idx = 0
+            
+            if is_five_ones:
+                # Pattern: 1,1,1,1,1, Type(i+5), ?(i+6), Count(i+7), ?(i+8), Attrs(i+9...)
+                type_hash = self.words[i+5]
+                count = self.words[i+7]
+                attr_start_idx = i + 9
+            else:
+                # Pattern: 1,1,1, Type(i+3), Count(i+4), ?, ?, Attrs(i+7...)
+                type_hash = self.words[i+3]
+                count = self.words[i+4]
+                attr_start_idx = i + 7 # Based on prev code
+            
+            if ATTLIB_MIN_HASH <= type_hash <= ATTLIB_MAX_HASH and 0 < count < 5000:
+                if type_hash not in self.noun_definitions:
+                    attr_hashes = []
+                    curr = attr_start_idx
+                    # Collect next 'count' VALID hashes?
+                    # Or assume contiguous block?
+                    # PIPE has clean list.
+                    added = 0
+                    # Scan a bit more than count to skip small ints?
+                    for k in range(min(count * 2, 5000)):
+                        if curr >= len(self.words): break
+                        if added >= count: break
                         
-                        self.noun_definitions[type_hash] = NounDefinition(type_hash=type_hash, attr_hashes=attr_hashes)
-                        # Advance iterator? 
-                        # To be safe, just increment by 1 is fine, but slow.
-                        # Let's skip passed count.
-                        # i = curr
-                        # But be careful not to skip next start adjacent?
-                        # Just let the loop proceed.
-            i += 1
+                        h = self.words[curr]
+                        if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH:
+                            attr_hashes.append(h)
+                            added += 1
+                        curr += 1
+                    
+                    self.noun_definitions[type_hash] = NounDefinition(type_hash=type_hash, attr_hashes=attr_hashes)
+                    # Advance iterator? 
+                    # To be safe, just increment by 1 is fine, but slow.
+                    # Let's skip passed count.
+                    # i = curr
+                    # But be careful not to skip next start adjacent?
+                    # Just let the loop proceed.
 
         # 补全那些出现在 ATNAIN 但没在 [1,1,1] 中被识别出的 Noun
         for noun_id, noun_hash in self.noun_id_to_hash.items():
@@ -210,28 +220,35 @@ class AttlibParser:
             s2_end = self.segment_pointers[3] * ATTLIB_WORDS_PER_PAGE
             
             # 记录所有在段 2 中发现的 NounHash
-            noun_hashes_in_order = []
-            for i in range(s2_start, s2_end - 1, 2):
-                h = self.words[i]
-                if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH:
-                    noun_hashes_in_order.append(h)
+            # 步长 2 的切片直接取出偶数位 word，再在推导式里按 hash 范围过滤
+            noun_hashes_in_order = [
+                h for h in self.words[s2_start:s2_end - 1:2]
+                if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH
+            ]
             
             # 通常 NounID 是 1-indexed 或者 0-indexed 的序号
-            for idx, h in enumerate(noun_hashes_in_order):
-                # 尝试 0-indexed 和 1-indexed (根据 PIPE=907 的采样，这里可能是 1-indexed)
-                self.noun_id_to_hash[idx] = h      # 0-indexed
-                self.noun_id_to_hash[idx + 1] = h  # 1-indexed
+            # 尝试 0-indexed 和 1-indexed (根据 PIPE=907 的采样，这里可能是 1-indexed)
+            # 逐个双写时 idx+1 总会被下一个 0-indexed 写入覆盖，最终结果等价于
+            # 0-indexed 整表 (一次 C 层 update) 加上末尾多出的 1-indexed 键 n
+            self.noun_id_to_hash.update(enumerate(noun_hashes_in_order))
+            if noun_hashes_in_order:
+                self.noun_id_to_hash[len(noun_hashes_in_order)] = noun_hashes_in_order[-1]
         
         print(f"Established {len(self.noun_id_to_hash)} potential NounID mappings from Segment 2")
 
         # 2. 启发式补充：从数据块中直接提取确定的绑定 (如 POS 所在的元数据块)
-        for i in range(len(self.words) - 20):
-            if self.words[i] == 545713 and 0 < self.words[i+1] < 10000:
+        # POS(545713) 命中和 [1,1,1] 起点各用 bytes.find 定位一次，回扫窗口 [i-50, i) 改为对起点列表二分
+        raw = self.words.tobytes()
+        triple_starts = find_aligned_words(raw, array('I', [1, 1, 1]).tobytes())
+        for i in find_aligned_words(raw, array('I', [545713]).tobytes()):
+            if i >= len(self.words) - 20:
+                break
+            if 0 < self.words[i+1] < 10000:
                 noun_id = self.words[i+1]
-                for j in range(max(0, i-50), i):
-                    if j+3 < len(self.words) and self.words[j] == 1 and self.words[j+1] == 1 and self.words[j+2] == 1:
-                        self.noun_id_to_hash[noun_id] = self.words[j+3]
-                        break
+                # 取窗口内最早的 [1,1,1]，与原逐个回扫遇到即停的结果一致
+                k = bisect_left(triple_starts, max(0, i-50))
+                if k < len(triple_starts) and triple_starts[k] < i:
+                    self.noun_id_to_hash[noun_id] = self.words[triple_starts[k] + 3]
 
         # 解析 ATNAIN 三元组 [AttrHash, NounID, Offset]
         self.atnain_mappings = {} # NounHash -> {AttrHash -> Offset}
@@ -260,20 +277,41 @@ class AttlibParser:
         """从 Segment 0 扫描属性类型定义"""
         print("Loading Attribute Types...")
         
-        for i in range(len(self.words) - 2):
-            h = self.words[i]
-            if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH:
-                dtype = self.words[i + 1]
-                if 1 <= dtype <= 10:
-                    if h not in self.hash_to_type:
-                        self.hash_to_type[h] = DATA_TYPE_MAP.get(dtype, f"UNKNOWN_{dtype}")
+        # 相邻 word 对 (h, dtype) 用 zip 错位切片在一个推导式里过滤，只对少量命中走 Python 循环
+        n = len(self.words)
+        candidates = [
+            (h, dtype)
+            for h, dtype in zip(self.words[:n - 2], self.words[1:n - 1])
+            if 1 <= dtype <= 10 and ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH
+        ]
+        for h, dtype in candidates:
+            if h not in self.hash_to_type:
+                self.hash_to_type[h] = DATA_TYPE_MAP.get(dtype, f"UNKNOWN_{dtype}")
         
         print(f"Loaded {len(self.hash_to_type)} type definitions.")
     
+    def _resolve_attr_name(self, attr_hash: int) -> str:
+        """属性名: 优先参考表，未找到或为 unk_ 时尝试 Base27 解码"""
+        name = self.hash_to_name.get(attr_hash)
+        if not name or name.startswith("unk_"):
+            decoded = decode_base27(attr_hash)
+            if decoded and not decoded.startswith("unk_"):
+                name = decoded
+            elif not name:
+                name = f"unk_{attr_hash}"
+        return name
+    
     def _build_noun_attr_map(self):
         """基于 Noun 定义构建最终映射"""
         print("Building Noun-Attribute map...")
-        self._load_atnain()
+        # atnain_mappings 已由 _scan_noun_definitions 中的 _load_atnain 填好，这里不再重复加载
+        
+        # 同一属性 hash 在多个 Noun 间共享，名称解析 (参考表 -> Base27 解码 -> unk_) 按 hash 只做一次
+        resolved_names = {}
+        for noun_def in self.noun_definitions.values():
+            for attr_hash in noun_def.attr_hashes:
+                if attr_hash not in resolved_names:
+                    resolved_names[attr_hash] = self._resolve_attr_name(attr_hash)
         
         for type_hash, noun_def in self.noun_definitions.items():
             type_hash_str = str(type_hash)
@@ -284,16 +322,7 @@ class AttlibParser:
             
             for attr_hash in noun_def.attr_hashes:
                 attr_hash_str = str(attr_hash)
-                name = self.hash_to_name.get(attr_hash)
-                
-                # 如果名称未找到或为 unk_，尝试 Base27 解码
-                if not name or name.startswith("unk_"):
-                    # 尝试解码
-                    decoded = decode_base27(attr_hash)
-                    if decoded and not decoded.startswith("unk_"):
-                        name = decoded
-                    elif not name:
-                         name = f"unk_{attr_hash}"
+                name = resolved_names[attr_hash]
 
                 att_type = self.hash_to_type.get(attr_hash, "UNKNOWN")
                 default_val = DEFAULT_VALUES.get(att_type, {})
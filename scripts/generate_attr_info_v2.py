@@ -3,10 +3,11 @@
 generate_attr_info.py - 从 attlib.dat 生成 all_attr_info.json
 基于最新的 Segment 4 分析结论。
 """
-import struct
+import mmap
 import json
 import sys
 import os
+from array import array
 from typing import Dict, List, Optional, Any
 
 # Constants
@@ -17,6 +18,9 @@ ATTLIB_SEGMENT_POINTERS_OFFSET = 0x0800
 ATTLIB_MIN_HASH = 100000
 ATTLIB_MAX_HASH = 999999999
 
+# Data Types Mapping (只有 1..8 有类型名，其余 dtype 忽略)
+ATTR_TYPE_NAMES = {1: "INTEGER", 2: "DOUBLE", 3: "BOOL", 4: "STRING", 5: "WORD", 6: "ELEMENT", 7: "POSITION", 8: "ORIENTATION"}
+
 # Known Data Type Sizes (in Words)
 TYPE_SIZES = {
     "POSITION": 6,     # 3 Double = 24 bytes
@@ -33,7 +37,7 @@ class AttlibParser:
     def __init__(self, attlib_path: str, ref_json_path: Optional[str] = None):
         self.attlib_path = attlib_path
         self.ref_json_path = ref_json_path
-        self.words: List[int] = []
+        self.words: array = array('I')
         self.hash_to_name: Dict[int, str] = {}
         self.hash_to_type: Dict[int, str] = {}
         self.noun_to_attr_list: Dict[int, List[int]] = {}
@@ -43,10 +47,15 @@ class AttlibParser:
         if self.ref_json_path:
             self._load_reference_names()
         
-        with open(self.attlib_path, 'rb') as f:
-            f.seek(ATTLIB_DATA_REGION_START)
-            data = f.read()
-            self.words = list(struct.unpack(f'>{len(data)//4}I', data))
+        # 只读映射文件，数据区只复制一次到 u32 数组，不再经过 f.read() 的中间 bytes
+        with open(self.attlib_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 整段读入 u32 数组 (大端序)，不再为每个 word 构造装箱 int 的元组和列表
+            data_end = ATTLIB_DATA_REGION_START + (len(mm) - ATTLIB_DATA_REGION_START) // 4 * 4
+            self.words = array('I')
+            with memoryview(mm) as mv, mv[ATTLIB_DATA_REGION_START:data_end] as data:
+                self.words.frombytes(data)
+            if sys.byteorder == 'little':
+                self.words.byteswap()
 
         self._load_attr_types()
         self._scan_segment_4()
@@ -62,14 +71,13 @@ class AttlibParser:
         
     def _load_attr_types(self):
         print("Scanning attribute types...")
-        for i in range(len(self.words) - 2):
-            h = self.words[i]
-            if ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH:
-                dtype = self.words[i+1]
-                if 1 <= dtype <= 20: # Wider range
-                    from_map = {1:"INTEGER", 2:"DOUBLE", 3:"BOOL", 4:"STRING", 5:"WORD", 6:"ELEMENT", 7:"POSITION", 8:"ORIENTATION"}.get(dtype)
-                    if from_map:
-                        self.hash_to_type[h] = from_map
+        # 相邻 word 对 (h, dtype) 用 zip 错位切片一次过滤，同一 hash 后出现的覆盖先出现的
+        n = len(self.words)
+        self.hash_to_type.update(
+            (h, ATTR_TYPE_NAMES[dtype])
+            for h, dtype in zip(self.words[:n - 2], self.words[1:n - 1])
+            if dtype in ATTR_TYPE_NAMES and ATTLIB_MIN_HASH <= h <= ATTLIB_MAX_HASH
+        )
 
     def _scan_segment_4(self):
         print("Scanning Segment 4 for Noun Attribute Lists...")
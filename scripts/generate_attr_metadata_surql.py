@@ -7,24 +7,23 @@
 
 import re
 import os
+from functools import lru_cache
 
+# 纯函数，同名属性/Noun 反复出现时直接命中缓存
+@lru_cache(maxsize=None)
 def db1_hash(hash_str):
     """实现 Rust 中的 db1_hash 函数逻辑"""
     chars = hash_str.encode('utf-8')
-    if len(chars) < 1:
+    if not chars:
         return 0
     
+    # 从末字节往前做 Horner 累加，直接迭代 reversed(bytes)，不再手工维护下标
     val = 0
-    i = len(chars) - 1
-    while i >= 0:
-        val = (val * 27) + (chars[i] - 64)
-        i -= 1
+    for c in reversed(chars):
+        val = val * 27 + (c - 64)
     
     # 处理溢出，模拟 Rust 的 saturating_add
-    result = val + 0x81BF1
-    if result > 0xFFFFFFFF:
-        result = 0xFFFFFFFF
-    return result & 0xFFFFFFFF
+    return min(val + 0x81BF1, 0xFFFFFFFF) & 0xFFFFFFFF
 
 def parse_attr_list_md(file_path):
     """解析属性列表.md文件，提取属性信息"""
@@ -78,7 +77,8 @@ DEFINE INDEX attr_metadata_name_idx ON attr_metadata FIELDS name UNIQUE;
 -- 插入属性元数据
 """
     
-    # 生成 INSERT 语句
+    # 生成 INSERT 语句: 先收集到列表，最后一次性拼接写入，避免字符串反复 += 拷贝
+    lines = [surql_content]
     for attr in attributes:
         hash_id = attr['hash']
         name = attr['name']
@@ -88,13 +88,13 @@ DEFINE INDEX attr_metadata_name_idx ON attr_metadata FIELDS name UNIQUE;
         desc_escaped = desc.replace("'", "\\'") if desc else None
         
         if desc_escaped:
-            surql_content += f"CREATE attr_metadata:{hash_id} SET name = '{name}', desc = '{desc_escaped}', hash = {hash_id};\n"
+            lines.append(f"CREATE attr_metadata:{hash_id} SET name = '{name}', desc = '{desc_escaped}', hash = {hash_id};\n")
         else:
-            surql_content += f"CREATE attr_metadata:{hash_id} SET name = '{name}', hash = {hash_id};\n"
+            lines.append(f"CREATE attr_metadata:{hash_id} SET name = '{name}', hash = {hash_id};\n")
     
     # 写入文件
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(surql_content)
+        f.write(''.join(lines))
     
     print(f'SURQL 文件已生成: {output_path}')
     print(f'共包含 {len(attributes)} 个属性')
@@ -6,26 +6,25 @@
 """
 
 import json
+from functools import lru_cache
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill
 
+# 纯函数，同名属性/Noun 反复出现时直接命中缓存
+@lru_cache(maxsize=None)
 def db1_hash(hash_str):
     """实现 Rust 中的 db1_hash 函数逻辑"""
     chars = hash_str.encode('utf-8')
-    if len(chars) < 1:
+    if not chars:
         return 0
     
+    # 从末字节往前做 Horner 累加，直接迭代 reversed(bytes)，不再手工维护下标
     val = 0
-    i = len(chars) - 1
-    while i >= 0:
-        val = (val * 27) + (chars[i] - 64)
-        i -= 1
+    for c in reversed(chars):
+        val = val * 27 + (c - 64)
     
     # 处理溢出，模拟 Rust 的 saturating_add
-    result = val + 0x81BF1
-    if result > 0xFFFFFFFF:
-        result = 0xFFFFFFFF
-    return result & 0xFFFFFFFF
+    return min(val + 0x81BF1, 0xFFFFFFFF) & 0xFFFFFFFF
 
 # NOUN 类型中文描述映射（常见类型）
 noun_descriptions = {
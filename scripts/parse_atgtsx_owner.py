@@ -16,30 +16,45 @@ from __future__ import annotations
 
 import argparse
 import json
+import mmap
 import struct
+import sys
+from array import array
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 PAGE_SIZE = 2048
 WORDS_PER_PAGE = 512
+WORDS_PER_PAGE_MASK = WORDS_PER_PAGE - 1  # 页内偏移掩码 0x1FF
+assert WORDS_PER_PAGE & WORDS_PER_PAGE_MASK == 0
 PAGE_SWITCH_MARK = 0x00000000
 SEGMENT_END_MARK = 0xFFFFFFFF
 DATA_REGION_START = 0x1000
 SEGMENT_POINTERS_OFFSET = 0x0800
 DB1_BASE = 0x81BF1
 
+SEGMENT_POINTERS_STRUCT = struct.Struct(">8I")
+WORD_STRUCT = struct.Struct(">I")
 
-def read_segment_pointers(f) -> List[int]:
-    f.seek(SEGMENT_POINTERS_OFFSET)
-    data = f.read(32)
-    return [struct.unpack(">I", data[i : i + 4])[0] for i in range(0, 32, 4)]
 
+def map_attlib(f) -> mmap.mmap:
+    """只读映射整个 attlib.dat，后续按页解包时不再逐页 seek/read。"""
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
-def read_page(f, page_num: int) -> List[int]:
-    f.seek(DATA_REGION_START + page_num * PAGE_SIZE)
-    raw = f.read(PAGE_SIZE)
-    return [struct.unpack(">I", raw[i : i + 4])[0] for i in range(0, PAGE_SIZE, 4)]
+
+def read_segment_pointers(buf) -> List[int]:
+    return list(SEGMENT_POINTERS_STRUCT.unpack_from(buf, SEGMENT_POINTERS_OFFSET))
+
+
+def load_data_words(buf) -> array:
+    """一次性把数据区解码成扁平的 u32 数组 (大端序)，全局字下标 = 页号 * 512 + 页内偏移。"""
+    words = array("I")
+    end = DATA_REGION_START + (len(buf) - DATA_REGION_START) // PAGE_SIZE * PAGE_SIZE
+    words.frombytes(buf[DATA_REGION_START:end])
+    if sys.byteorder == "little":
+        words.byteswap()
+    return words
 
 
 def decode_pack_code(pack_code: int) -> str:
@@ -80,82 +95,83 @@ class AtgtsxRecord:
         return decode_pack_code(self.pack_code)
 
 
-def iter_atgtsx_records(f, start_page: int) -> Iterator[AtgtsxRecord]:
-    page_num = start_page
-    word_idx = 0
+@dataclass
+class AtgtsxColumns:
+    """ATGTSX 三元组按列存放 (SoA)，整段扫描时不再为每条记录构造对象。"""
+
+    pack_codes: array
+    index_ptrs: array
+    third_values: array
+
+    def __len__(self) -> int:
+        return len(self.pack_codes)
+
+    def record(self, i: int) -> AtgtsxRecord:
+        return AtgtsxRecord(self.pack_codes[i], self.index_ptrs[i], self.third_values[i])
+
+
+def read_atgtsx_columns(words: array, start_page: int) -> AtgtsxColumns:
+    """在整段解码后的字数组上用单一游标推进，跨页读取无需再换页重取。"""
+    pack_codes = array("I")
+    index_ptrs = array("I")
+    third_values = array("I")
+    pos = start_page * WORDS_PER_PAGE
     while True:
-        words = read_page(f, page_num)
-        while word_idx < WORDS_PER_PAGE:
-            word = words[word_idx]
-            word_idx += 1
-
-            if word == PAGE_SWITCH_MARK:
-                page_num += 1
-                word_idx = 0
-                break
-
-            if word == SEGMENT_END_MARK:
-                return
-
-            pack_code = word
-            if word_idx >= WORDS_PER_PAGE:
-                page_num += 1
-                words = read_page(f, page_num)
-                word_idx = 0
-            index_ptr = words[word_idx]
-            word_idx += 1
-
-            if word_idx >= WORDS_PER_PAGE:
-                page_num += 1
-                words = read_page(f, page_num)
-                word_idx = 0
-            third_value = words[word_idx]
-            word_idx += 1
-
-            yield AtgtsxRecord(pack_code, index_ptr, third_value)
-
-
-def read_token_stream(f, string_segment_start: int, offset: int) -> List[int]:
-    """index_ptr 指向的 token 流，结束于 0 或 SEGMENT_END_MARK。"""
+        word = words[pos]
+
+        if word == PAGE_SWITCH_MARK:
+            pos = (pos | WORDS_PER_PAGE_MASK) + 1  # 跳到下一页页首
+            continue
+
+        if word == SEGMENT_END_MARK:
+            break
+
+        pack_codes.append(word)
+        index_ptrs.append(words[pos + 1])
+        third_values.append(words[pos + 2])
+        pos += 3
+
+    return AtgtsxColumns(pack_codes, index_ptrs, third_values)
+
+
+def read_token_stream(buf, string_segment_start: int, offset: int) -> List[int]:
+    """index_ptr 指向的 token 流，遇 0 换页，结束于 SEGMENT_END_MARK。
+
+    token 流只有几十个字，直接按需从映射中取字，不为此解码整个数据区。
+    """
     tokens: List[int] = []
-    current_page = string_segment_start + offset // WORDS_PER_PAGE
-    idx = offset % WORDS_PER_PAGE
+    pos = string_segment_start * WORDS_PER_PAGE + offset
 
     while True:
-        words = read_page(f, current_page)
-        while idx < WORDS_PER_PAGE:
-            value = words[idx]
-            idx += 1
-            if value == PAGE_SWITCH_MARK:
-                current_page += 1
-                idx = 0
-                break
-            if value == 0 or value == SEGMENT_END_MARK:
-                return tokens
-            tokens.append(value)
-        else:
-            current_page += 1
-            idx = 0
-
-
-def load_owner_records(file_path: Path) -> Tuple[List[int], List[AtgtsxRecord]]:
-    with file_path.open("rb") as f:
-        pointers = read_segment_pointers(f)
-        atgtsx_start = pointers[3]
-        string_start = pointers[4]
-        records = [
-            rec
-            for rec in iter_atgtsx_records(f, atgtsx_start)
-            if rec.attr_name == "OWNER"
-        ]
+        (value,) = WORD_STRUCT.unpack_from(buf, DATA_REGION_START + pos * 4)
+        if value == PAGE_SWITCH_MARK:
+            pos = (pos | WORDS_PER_PAGE_MASK) + 1  # 跳到下一页页首
+            continue
+        if value == SEGMENT_END_MARK:
+            return tokens
+        tokens.append(value)
+        pos += 1
+
+
+def load_owner_records(buf) -> Tuple[int, List[AtgtsxRecord]]:
+    pointers = read_segment_pointers(buf)
+    atgtsx_start = pointers[3]
+    string_start = pointers[4]
+    columns = read_atgtsx_columns(load_data_words(buf), atgtsx_start)
+    # 每个不同的 pack_code 只解码一次，仅为命中的记录构造 AtgtsxRecord
+    owner_codes = {
+        code for code in set(columns.pack_codes) if decode_pack_code(code) == "OWNER"
+    }
+    records = [
+        columns.record(i)
+        for i, code in enumerate(columns.pack_codes)
+        if code in owner_codes
+    ]
     return string_start, records
 
 
-def summarize_owner(
-    file_path: Path, owner_record: AtgtsxRecord, string_page_start: int
-) -> dict:
-    with file_path.open("rb") as f:
-        token_values = read_token_stream(f, string_page_start, owner_record.index_ptr)
+def summarize_owner(buf, owner_record: AtgtsxRecord, string_page_start: int) -> dict:
+    token_values = read_token_stream(buf, string_page_start, owner_record.index_ptr)
 
     decoded_tokens = [
         {"value": value, "text": db1_dehash(value)} for value in token_values
@@ -185,14 +201,16 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    string_start, owners = load_owner_records(args.attlib)
-    if not owners:
-        raise SystemExit("未在 ATGTSX 中找到 pack_code = OWNER 的记录")
+    # 记录扫描与 token 读取共用同一个只读映射
+    with args.attlib.open("rb") as f, map_attlib(f) as mm:
+        string_start, owners = load_owner_records(mm)
+        if not owners:
+            raise SystemExit("未在 ATGTSX 中找到 pack_code = OWNER 的记录")
 
-    if len(owners) > 1:
-        print(f"警告：检测到 {len(owners)} 条 OWNER 记录，默认解析第一条。")
+        if len(owners) > 1:
+            print(f"警告：检测到 {len(owners)} 条 OWNER 记录，默认解析第一条。")
 
-    owner_info = summarize_owner(args.attlib, owners[0], string_start)
+        owner_info = summarize_owner(mm, owners[0], string_start)
     args.output.write_text(json.dumps(owner_info, ensure_ascii=False, indent=2))
 
     print(f"发现 OWNER 记录数量: {len(owners)}")
@@ -15,13 +15,19 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
 
+MIN_HASH = 531442
+MAX_HASH = 387951929
+WORDS_PER_PAGE_SHIFT = 9  # 每页 512 = 2^9 个字
+WORDS_PER_PAGE_MASK = (1 << WORDS_PER_PAGE_SHIFT) - 1  # 0x1FF
+
 class AttlibCompleteParser:
     """完整解析 attlib.dat 文件"""
     
     def __init__(self, attlib_path: str):
         self.attlib_path = Path(attlib_path)
         self.page_size = 2048  # FHDBRN 页大小
-        self.words_per_page = 512  # 每页 512 个 32 位字
+        self.words_per_page = 1 << WORDS_PER_PAGE_SHIFT  # 每页 512 个 32 位字
+        self.page_struct = struct.Struct(f'>{self.words_per_page}I')  # 整页解包 (大端序)
         
         # 存储解析结果
         self.section_pointers = []  # 段指针
@@ -29,6 +35,7 @@ class AttlibCompleteParser:
         self.attribute_index = {}   # attr_hash -> (record_num, slot_offset)
         self.attribute_definitions = {}  # attr_hash -> attr_data
         self.noun_hierarchy = defaultdict(set)  # parent_noun -> set(child_nouns)
+        self.section_cache = {}  # start_page -> 段内数据字
         
     def read_file_header(self, file) -> Dict:
         """读取文件头"""
@@ -62,47 +69,71 @@ class AttlibCompleteParser:
         
         return pointers
     
-    def read_page(self, file, page_num: int) -> List[int]:
+    def load_file(self, file) -> memoryview:
+        """一次 readinto 把整个文件读入预分配的 bytearray，按页取数时直接切片"""
+        buf = bytearray(self.attlib_path.stat().st_size)
+        view = memoryview(buf)
+        filled = 0
+        file.seek(0)
+        while filled < len(buf):
+            n = file.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        return view[:filled]
+    
+    def read_page(self, buf: memoryview, page_num: int) -> List[int]:
         """读取指定页的 512 个 32 位字"""
         offset = page_num * self.page_size
-        file.seek(offset)
-        data = file.read(self.page_size)
-        
-        if len(data) < self.page_size:
+        if offset + self.page_size > len(buf):
             return []
         
-        words = []
-        for i in range(self.words_per_page):
-            word_bytes = data[i*4:(i+1)*4]
-            word = struct.unpack('>I', word_bytes)[0]  # 大端序
-            words.append(word)
-        
-        return words
+        return list(self.page_struct.unpack_from(buf, offset))
     
-    def parse_section(self, file, start_page: int, section_name: str) -> List[int]:
-        """解析一个完整的数据段"""
+    @staticmethod
+    def _find_mark(words: List[int], mark: int) -> int:
+        """返回标记在页内首次出现的位置，不存在时返回页长度"""
+        try:
+            return words.index(mark)
+        except ValueError:
+            return len(words)
+    
+    def parse_section(self, buf: memoryview, start_page: int, section_name: str) -> List[int]:
+        """解析一个完整的数据段 (按起始页缓存，多个段指针指向同一页时只扫描一次)"""
         print(f"\n📖 解析段: {section_name} (起始页: {start_page})")
         
+        if start_page in self.section_cache:
+            all_words = self.section_cache[start_page]
+            print(f"  ✓ 起始页 {start_page} 已解析，复用 {len(all_words)} 个字")
+            return all_words
+        
+        all_words = self._scan_section(buf, start_page)
+        self.section_cache[start_page] = all_words
+        return all_words
+    
+    def _scan_section(self, buf: memoryview, start_page: int) -> List[int]:
+        """从起始页开始顺序读取，直到段结束标记"""
         all_words = []
         page_num = start_page
         total_pages = 0
         
         while total_pages < 1000:  # 最多读取 1000 页防止死循环
-            words = self.read_page(file, page_num)
+            words = self.read_page(buf, page_num)
             if not words:
                 break
             
             total_pages += 1
             
-            for word in words:
-                if word == 0xFFFFFFFF:  # 段结束标记
-                    print(f"  ✓ 段结束标记，共 {total_pages} 页，{len(all_words)} 个字")
-                    return all_words
-                elif word == 0x00000000:  # 页切换标记
-                    page_num += 1
-                    break
-                else:
-                    all_words.append(word)
+            # 用 list.index 在 C 层定位两种标记，整段切片追加，不再逐字判断
+            end_idx = self._find_mark(words, 0xFFFFFFFF)  # 段结束标记
+            switch_idx = self._find_mark(words, 0x00000000)  # 页切换标记
+            if end_idx < switch_idx:
+                all_words.extend(words[:end_idx])
+                print(f"  ✓ 段结束标记，共 {total_pages} 页，{len(all_words)} 个字")
+                return all_words
+            all_words.extend(words[:switch_idx])
+            if switch_idx < len(words):
+                page_num += 1
         
         print(f"  ⚠️ 未找到段结束标记，读取 {total_pages} 页")
         return all_words
@@ -130,15 +161,13 @@ class AttlibCompleteParser:
         
         i = 0
         attr_count = 0
-        min_hash = 531442
-        max_hash = 387951929
         
         while i < len(words) - 1:
             attr_hash = words[i]
             i += 1
             
             # 范围检查
-            if attr_hash < min_hash or attr_hash > max_hash:
+            if not (MIN_HASH <= attr_hash <= MAX_HASH):
                 continue
             
             if i >= len(words):
@@ -147,8 +176,8 @@ class AttlibCompleteParser:
             combined = words[i]
             i += 1
             
-            record_num = combined // 512
-            slot_offset = combined % 512
+            record_num = combined >> WORDS_PER_PAGE_SHIFT
+            slot_offset = combined & WORDS_PER_PAGE_MASK
             
             self.attribute_index[attr_hash] = (record_num, slot_offset)
             attr_count += 1
@@ -162,15 +191,13 @@ class AttlibCompleteParser:
         
         i = 0
         attr_count = 0
-        min_hash = 531442
-        max_hash = 387951929
         
         while i < len(words) - 2:
             attr_hash = words[i]
             i += 1
             
             # 范围检查
-            if attr_hash < min_hash or attr_hash > max_hash:
+            if not (MIN_HASH <= attr_hash <= MAX_HASH):
                 continue
             
             if i >= len(words) - 1:
@@ -252,7 +279,7 @@ class AttlibCompleteParser:
         print(f"\n📁 文件: {self.attlib_path}")
         print(f"📏 大小: {file_size:,} 字节 ({file_size/1024/1024:.2f} MB)")
         
-        with open(self.attlib_path, 'rb') as f:
+        with open(self.attlib_path, 'rb', buffering=0) as f:
             # 1. 读取文件头
             print("\n📖 Step 1: 读取文件头...")
             header = self.read_file_header(f)
@@ -267,18 +294,19 @@ class AttlibCompleteParser:
             
             # 3. 解析各个段
             print("\n📖 Step 3: 解析数据段...")
+            buf = self.load_file(f)
             
             # ATGTIX - 属性索引段
-            atgtix_words = self.parse_section(f, self.section_pointers[0], "ATGTIX")
+            atgtix_words = self.parse_section(buf, self.section_pointers[0], "ATGTIX")
             self.parse_atgtix_section(atgtix_words)
             
             # ATGTDF - 属性定义段
-            atgtdf_words = self.parse_section(f, self.section_pointers[1], "ATGTDF")
+            atgtdf_words = self.parse_section(buf, self.section_pointers[1], "ATGTDF")
             self.parse_atgtdf_section(atgtdf_words)
             
             # 其他段
             for i in range(2, min(len(self.section_pointers), 8)):
-                section_words = self.parse_section(f, self.section_pointers[i], f"段{i+1}")
+                section_words = self.parse_section(buf, self.section_pointers[i], f"段{i+1}")
                 print(f"  段 {i+1}: {len(section_words)} 个字")
             
             # 4. 分析 Noun 类型
@@ -6,12 +6,17 @@ attlib.dat 解析器 - Python 版本
 
 import struct
 import json
+import sys
+from array import array
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 
 # 常量定义
 PAGE_SIZE = 2048
 WORDS_PER_PAGE = 512
+WORDS_PER_PAGE_SHIFT = 9  # combined >> 9 即页号
+WORDS_PER_PAGE_MASK = WORDS_PER_PAGE - 1  # combined & 0x1FF 即页内偏移
+assert WORDS_PER_PAGE == 1 << WORDS_PER_PAGE_SHIFT
 MIN_HASH = 531442
 MAX_HASH = 387951929
 PAGE_SWITCH_MARK = 0x00000000
@@ -25,10 +30,10 @@ class AttlibAttrIndex:
     combined: int
     
     def record_num(self) -> int:
-        return self.combined // 512
+        return self.combined >> WORDS_PER_PAGE_SHIFT
     
     def slot_offset(self) -> int:
-        return self.combined % 512
+        return self.combined & WORDS_PER_PAGE_MASK
 
 @dataclass
 class AttlibAttrDefinition:
@@ -44,7 +49,7 @@ class AttlibParser:
         self.attr_index: Dict[int, AttlibAttrIndex] = {}
         self.attr_definitions: Dict[int, AttlibAttrDefinition] = {}
         self.segment_pointers = self._read_segment_pointers()
-        self.page_cache: Dict[int, List[int]] = {}
+        self.page_cache: Dict[int, array] = {}  # 每页 2 KiB 连续存储，不再是装箱 int 列表
     
     def _read_segment_pointers(self) -> List[int]:
         """读取段指针表"""
@@ -61,7 +66,7 @@ class AttlibParser:
         
         return pointers
     
-    def read_page(self, page_num: int) -> List[int]:
+    def read_page(self, page_num: int) -> array:
         """读取指定页号的页面"""
         if page_num in self.page_cache:
             return self.page_cache[page_num]
@@ -70,11 +75,10 @@ class AttlibParser:
         self.file.seek(file_offset)
         page_data = self.file.read(PAGE_SIZE)
         
-        words = []
-        for i in range(WORDS_PER_PAGE):
-            word_bytes = page_data[i*4:(i+1)*4]
-            word = struct.unpack('>I', word_bytes)[0]  # 大端序
-            words.append(word)
+        # 整页一次转成 u32 数组 (大端序)
+        words = array('I', page_data)
+        if sys.byteorder == 'little':
+            words.byteswap()
         
         self.page_cache[page_num] = words
         return words
@@ -107,7 +111,7 @@ class AttlibParser:
                     continue
                 
                 # 检查是否为有效哈希值
-                if word < MIN_HASH or word > MAX_HASH:
+                if not (MIN_HASH <= word <= MAX_HASH):
                     continue
                 
                 attr_hash = word
@@ -213,7 +217,7 @@ class AttlibParser:
                     print(f"  ATGTIX 加载完成，共 {record_count} 条记录")
                     return
                 
-                if word < MIN_HASH or word > MAX_HASH:
+                if not (MIN_HASH <= word <= MAX_HASH):
                     continue
                 
                 attr_hash = word
@@ -47,14 +47,9 @@ while curr + 2 < len(words):
 print(f"Found {len(noun_attrs)} Nouns in ATNAIN.")
 
 # Filter for Nouns that have QANG(867166), QRAD(879205), QPAR(877761), QARR(867285), QLEA(874936)
-target_hashes = [867166, 879205, 877761, 867285, 874936]
-candidates = []
-for nid, attrs in noun_attrs.items():
-    # If it has at least 1 of these (relaxed filter)
-    for h in target_hashes:
-        if h in attrs: 
-            candidates.append(nid)
-            break
+target_hashes = frozenset([867166, 879205, 877761, 867285, 874936])
+# If it has at least 1 of these (relaxed filter): 集合求交在 C 层完成，不再逐个 hash 判断
+candidates = [nid for nid, attrs in noun_attrs.items() if not target_hashes.isdisjoint(attrs)]
     
 print(f"Found {len(candidates)} Strong Piping Candidates.")
 
@@ -1,6 +1,9 @@
 
 import struct
 import sys
+from bisect import bisect_right
+
+from attlib_io import find_aligned_words
 
 ATTLIB_PAGE_SIZE = 2048
 ATTLIB_WORDS_PER_PAGE = 512
@@ -34,37 +37,35 @@ path = "/Volumes/DPC/work/plant-code/aios-parse-pdms-fork/data/attlib.dat"
 
 hashes_to_find = [828473, 641779, 620516]
 
+# [3, 4, 1415, 1433, 1466, 1467, 1923, 1929] 中 S0..S6 的起始页，S3: 1433 (ATNAIN)
+SEGMENT_START_PAGES = [3, 4, 1415, 1433, 1466, 1467, 1923]
+
+def find_word_hits(data, targets):
+    """在原始字节上用 bytes.find 定位目标 word (仅保留 4 字节对齐的命中)，避免逐 word 解包比较"""
+    hits = []
+    for h in targets:
+        hits.extend((i, h) for i in find_aligned_words(data, struct.pack('>I', h)))
+    hits.sort()
+    return hits
+
 with open(path, 'rb') as f:
     data = f.read()
-    words = list(struct.unpack(f'>{len(data)//4}I', data))
+total_words = len(data) // 4
 
-print(f"Searching for {hashes_to_find} in {len(words)} words...")
+print(f"Searching for {hashes_to_find} in {total_words} words...")
 found_count = 0
-for i, w in enumerate(words):
-    if w in hashes_to_find:
-        found_count += 1
-        page = i // 512
-        segment = -1
-        # [3, 4, 1415, 1433, 1466, 1467, 1923, 1929]
-        # S0: 3
-        # S1: 4
-        # S2: 1415
-        # S3: 1433 (ATNAIN)
-        # S4: 1466
-        # S5: 1467
-        # S6: 1923
-        if page >= 1923: segment = 6
-        elif page >= 1467: segment = 5
-        elif page >= 1466: segment = 4
-        elif page >= 1433: segment = 3
-        elif page >= 1415: segment = 2
-        elif page >= 4: segment = 1
-        elif page >= 3: segment = 0
-        
-        print(f"Found {w} at word index {i} (Page {page}, Offset {i % 512}, Segment {segment})")
-        # Print context
-        context = words[max(0, i-10):i+20]
-        print(f"Context: {context}")
+for i, w in find_word_hits(data, hashes_to_find):
+    found_count += 1
+    page = i // 512
+    # 段起始页有序，二分定位所属段 (页号小于 S0 时为 -1)
+    segment = bisect_right(SEGMENT_START_PAGES, page) - 1
+    
+    print(f"Found {w} at word index {i} (Page {page}, Offset {i % 512}, Segment {segment})")
+    # Print context
+    ctx_start = max(0, i-10)
+    ctx_end = min(total_words, i+20)
+    context = list(struct.unpack_from(f'>{ctx_end - ctx_start}I', data, ctx_start * 4))
+    print(f"Context: {context}")
 
 if found_count == 0:
     print("Not found.")
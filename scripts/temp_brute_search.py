@@ -34,6 +34,10 @@ def search():
         start = max(0, pos - 32)
         end = min(len(data), pos + 32)
         chunk = data[start:end]
+        # 绝大多数命中附近没有 PIPE 哈希，先做一次 C 层子串判断再解包
+        if pipe_hash_be not in chunk:
+            pos += 4
+            continue
         words = struct.unpack(f">{len(chunk)//4}I", chunk[:(len(chunk)//4)*4])
         if pipe_hash in words:
             print(f"  Found 907 near PIPE Hash at offset 0x{pos:08X}!")
@@ -1,35 +1,15 @@
-import struct
+from attlib_io import decode_base27, read_segment_pointers, read_words
 
 ATTLIB_PATH = "/Volumes/DPC/work/plant-code/aios-parse-pdms-fork/data/attlib.dat"
-PAGE_SIZE = 2048
-DATA_REGION_START = 0x1000
-SEGMENT_POINTERS_OFFSET = 0x0800
-
-def decode_base27(hash_val):
-    BASE27_OFFSET = 0x81BF1
-    if hash_val < 531442: return ""
-    k = hash_val - BASE27_OFFSET
-    chars = []
-    while k > 0:
-        c = k % 27
-        if c == 0: chars.append(' ')
-        else: chars.append(chr(c + 64))
-        k //= 27
-    return "".join(chars)
 
 def analyze():
     with open(ATTLIB_PATH, "rb") as f:
-        f.seek(SEGMENT_POINTERS_OFFSET)
-        ptrs = struct.unpack(">8I", f.read(32))
+        ptrs = read_segment_pointers(f)
         start_page = ptrs[2]
         end_page = ptrs[3]
 
-        all_words = []
-        for p in range(start_page, end_page):
-            f.seek(DATA_REGION_START + p * PAGE_SIZE)
-            page_data = f.read(PAGE_SIZE)
-            words = struct.unpack(">512I", page_data)
-            all_words.extend(words)
+        # 段内页连续，一次读入整段到单个 u32 数组
+        all_words = read_words(f, start_page, end_page)
 
         # 尝试不同的记录步长
         results = []